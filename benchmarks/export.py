@@ -0,0 +1,40 @@
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+
+from pycrashreport.crash_report import get_crash_report_from_buf
+from pycrashreport.export import DEFAULT_BATCH_SIZE, ExportFormat, Exporter
+
+TESTS = Path(__file__).parent.parent / "tests"
+FIXTURES = [path.read_text() for path in sorted(TESTS.glob("*.ips"))]
+
+
+def main(
+    reports: int = typer.Option(20000, help="Reports to export"),
+    formats: str = "parquet,arrow,csv",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    # parsing included: every report is parsed fresh, as in a nightly export
+    print(f"{'format':>8} {'elapsed':>10} {'reports/s':>10} {'size':>10}")
+    for output_format in (ExportFormat(name) for name in formats.split(",")):
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory() as directory:
+            with Exporter(directory, output_format, batch_size) as exporter:
+                for index in range(reports):
+                    exporter.add(
+                        get_crash_report_from_buf(
+                            FIXTURES[index % len(FIXTURES)], projection=()
+                        )
+                    )
+            elapsed = time.perf_counter() - started
+            size = sum(path.stat().st_size for path in Path(directory).iterdir())
+        print(
+            f"{output_format.value:>8} {elapsed * 1000:>8.0f}ms "
+            f"{reports / elapsed:>10.0f} {size / 1e6:>8.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,149 @@
+import json
+import re
+import timeit
+from pathlib import Path
+
+import typer
+
+from pycrashreport.crash_report import get_crash_report_from_buf
+
+FIXTURE = (
+    Path(__file__).parent.parent
+    / "tests"
+    / "kernel_mode_crash_report_ios16_forceReset-full.ips"
+)
+PROPERTIES = (
+    "panic_string",
+    "panic_caller",
+    "debugger_message",
+    "memory_id",
+    "os_release_type",
+    "os_version",
+    "kernel_version",
+    "fileset_kernelcache_uuid",
+    "kernel_uuid",
+    "boot_session_uuid",
+    "iboot_version",
+    "secure_boot",
+    "roots_installed",
+    "paniclog_version",
+    "panicked_task",
+    "panicked_thread",
+    "kernel_extensions_in_backtrace",
+    "last_started_kext",
+    "loaded_kexts",
+)
+LINE_VALUE_PREFIXES = (
+    "Debugger message",
+    "Memory ID",
+    "OS release type",
+    "OS version",
+    "Kernel version",
+    "Fileset Kernelcache UUID",
+    "Kernel UUID",
+    "Boot session UUID",
+    "iBoot version",
+    "secure boot?",
+    "roots installed",
+    "Paniclog version",
+)
+
+
+def per_property_scan(panic_text: str) -> None:
+    # the previous approach: every property re-splits the text and runs its own
+    # inline pattern over each line until it finds its match
+    def lines():
+        return panic_text.splitlines()
+
+    first_line = lines()[0]
+    re.match(r"panic\(cpu \d+ caller 0x[0-9a-fA-F]+\): (.+)", first_line)
+    re.search(r" caller (0x[0-9a-fA-F]+)\):", lines()[0])
+    for prefix in LINE_VALUE_PREFIXES:
+        for line in lines():
+            if line.startswith(prefix):
+                break
+    for line in lines():
+        if re.match(
+            r"Panicked task (0x[0-9a-fA-F]+): (\d+) pages, (\d+) threads: pid (\d+): (.+)",
+            line,
+        ):
+            break
+    for line in lines():
+        if re.match(
+            r"Panicked thread: (0x[0-9a-fA-F]+), backtrace: (0x[0-9a-fA-F]+), tid: (\d+)",
+            line,
+        ):
+            break
+    in_section = False
+    for line in lines():
+        stripped = line.strip()
+        if stripped == "Kernel Extensions in backtrace:":
+            in_section = True
+            continue
+        if not in_section:
+            continue
+        if not stripped:
+            break
+        re.match(
+            r"(.+)\((.+)\)\[([0-9A-F-]+)]@(0x[0-9a-fA-F]+)->(0x[0-9a-fA-F]+)", stripped
+        )
+    for line in lines():
+        if line.startswith("last started kext at "):
+            break
+    in_section = False
+    for line in lines():
+        if line == "loaded kexts:":
+            in_section = True
+            continue
+        if in_section and not line.strip():
+            break
+
+
+def scaled_report(scale: int) -> str:
+    metadata, body = FIXTURE.read_text().split("\n", 1)
+    data = json.loads(body)
+    head, kexts = data["string"].split("loaded kexts:\n", 1)
+    kexts, tail = kexts.split("\n\n", 1) if "\n\n" in kexts else (kexts, "")
+    # grow both the backtrace part and the loaded kexts list
+    head = head.replace(
+        "Kernel Extensions in backtrace:",
+        "\n".join(["      lr: 0xfffffff02e156784  fp: 0xffffffecfb44f7e0"] * 64 * scale)
+        + "\nKernel Extensions in backtrace:",
+    )
+    data["string"] = (
+        head + "loaded kexts:\n" + "\n".join([kexts] * scale) + "\n\n" + tail
+    )
+    return metadata + "\n" + json.dumps(data)
+
+
+def main(
+    scales: str = "1,10,100", number: int = typer.Option(20, help="Runs per scale")
+) -> None:
+    print(
+        f"{'scale':>6} {'lines':>8} {'per-property':>14} {'single-pass':>12} {'speedup':>8}"
+    )
+    for scale in (int(scale) for scale in scales.split(",")):
+        buf = scaled_report(scale)
+        panic_text = get_crash_report_from_buf(buf)._panic_text
+
+        # bound explicitly so each closure keeps its own scale if it is ever called
+        # after the loop moved on, e.g. once timings are collected across scales (B023)
+        def single_pass(buf=buf):
+            crash_report = get_crash_report_from_buf(buf)
+            for name in PROPERTIES:
+                getattr(crash_report, name)
+
+        def per_property(buf=buf, panic_text=panic_text):
+            get_crash_report_from_buf(buf)
+            per_property_scan(panic_text)
+
+        old = min(timeit.repeat(per_property, number=number, repeat=3)) / number
+        new = min(timeit.repeat(single_pass, number=number, repeat=3)) / number
+        print(
+            f"{scale:>6} {panic_text.count(chr(10)):>8} {old * 1000:>12.2f}ms "
+            f"{new * 1000:>10.2f}ms {old / new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,70 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import typer
+
+from pycrashreport.crash_report import (
+    get_crash_report_from_buf,
+    get_crash_reports_from_paths,
+)
+
+TESTS = Path(__file__).parent.parent / "tests"
+FIXTURES = sorted(TESTS.glob("*.ips"))
+
+
+def gil_enabled() -> bool:
+    # `sys._is_gil_enabled` only exists from 3.13 on, older builds always have one
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+def batch(paths, workers: int) -> float:
+    started = time.perf_counter()
+    for crash_report in get_crash_reports_from_paths(paths, max_workers=workers):
+        crash_report.parse_all()
+    return time.perf_counter() - started
+
+
+def shared(buf: str, workers: int, readers: int) -> float:
+    # many threads resolving every property of the same fresh report at once, like
+    # request handlers sharing a parsed report
+    crash_report = get_crash_report_from_buf(buf)
+    barrier = threading.Barrier(workers)
+
+    def read(_):
+        barrier.wait()
+        for _ in range(readers):
+            crash_report.parse_all()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(read, range(workers)))
+    return time.perf_counter() - started
+
+
+def main(
+    workers: str = "1,2,4,8",
+    reports: int = typer.Option(2000, help="Reports per batch run"),
+) -> None:
+    print(f"python {sys.version.split()[0]}, GIL {'on' if gil_enabled() else 'off'}")
+    paths = (FIXTURES * (reports // len(FIXTURES) + 1))[:reports]
+    buf = (TESTS / "kernel_mode_crash_report_ios16_forceReset-full.ips").read_text()
+
+    print(
+        f"{'workers':>8} {'batch':>10} {'reports/s':>10} {'speedup':>8} {'shared':>10}"
+    )
+    baseline = None
+    for count in (int(count) for count in workers.split(",")):
+        elapsed = batch(paths, count)
+        baseline = baseline or elapsed
+        print(
+            f"{count:>8} {elapsed * 1000:>8.0f}ms {reports / elapsed:>10.0f} "
+            f"{baseline / elapsed:>7.1f}x {shared(buf, count, 200) * 1000:>8.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
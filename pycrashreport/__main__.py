@@ -1,16 +1,243 @@
-from typing import Annotated
+import os
+import sys
+from pathlib import Path
+from typing import Annotated, List, Optional
 
 import typer
+from typer.core import TyperGroup
 
-from pycrashreport.crash_report import get_crash_report_from_file
+from pycrashreport import server
+from pycrashreport.compare import compare_corpora
+from pycrashreport.crash_report import (
+    REPORT_PATTERNS,
+    get_crash_report_from_file,
+    get_crash_reports_from_directory,
+    get_crash_reports_from_paths,
+    summarize_errors,
+)
+from pycrashreport.export import DEFAULT_BATCH_SIZE, ExportFormat, export_crash_reports
+from pycrashreport.filters import BODY_FIELDS, METADATA_FIELDS, Filter
+from pycrashreport.render import OutputFormat, Renderer
+from pycrashreport.sampling import DEFAULT_PER_STRATUM, StratifiedSampler
+from pycrashreport.watch import DirectoryWatcher
 
 
-def main(file: Annotated[typer.FileText, typer.Argument()]) -> None:
-    print(get_crash_report_from_file(file))
+class DefaultCommandGroup(TyperGroup):
+    # keeps `pycrashreport <file>` working alongside the subcommands
+    default_command = "parse"
+
+    def parse_args(self, ctx, args):
+        if args and not args[0].startswith("-") and args[0] not in self.commands:
+            args.insert(0, self.default_command)
+        return super().parse_args(ctx, args)
+
+
+app = typer.Typer(cls=DefaultCommandGroup, add_completion=False)
+
+FormatOption = Annotated[
+    Optional[OutputFormat],
+    typer.Option("--format", help="Defaults to ansi on a terminal and plain otherwise"),
+]
+
+
+def _renderer(output_format: Optional[OutputFormat]) -> Renderer:
+    if output_format is None:
+        output_format = OutputFormat.ANSI if sys.stdout.isatty() else OutputFormat.PLAIN
+    return Renderer(sys.stdout, output_format)
+
+
+def _print(renderer: Renderer, crash_report) -> None:
+    renderer.render(crash_report)
+    if renderer.output_format is not OutputFormat.COMPACT:
+        renderer.write("\n")
+
+
+@app.command()
+def parse(
+    files: Annotated[List[typer.FileBinaryRead], typer.Argument()],
+    output_format: FormatOption = None,
+    tolerant: Annotated[
+        bool, typer.Option(help="Print what could be parsed of malformed reports")
+    ] = False,
+    where: Annotated[
+        Optional[str],
+        typer.Option(
+            help="Only reports matching e.g. 'bug_type == 109 and name == \"kaki\"'"
+        ),
+    ] = None,
+) -> None:
+    renderer = _renderer(output_format)
+    where = Filter(where) if where is not None else None
+    for file in files:
+        if where is None:
+            crash_report = get_crash_report_from_file(file, tolerant=tolerant)
+        else:
+            crash_report = where.read(file, tolerant)
+            if crash_report is None:
+                file.close()
+                continue
+        _print(renderer, crash_report)
+        for error in crash_report.errors:
+            typer.echo(
+                f"{file.name}: {error.field}: {type(error.error).__name__}: "
+                f"{error.error}",
+                err=True,
+            )
+        # release each report before parsing the next one
+        file.close()
+
+
+@app.command()
+def watch(
+    directory: Annotated[Path, typer.Argument(exists=True, file_okay=False)],
+    cursor: Annotated[
+        Optional[Path], typer.Option(help="Persist already seen reports here")
+    ] = None,
+    interval: Annotated[float, typer.Option(help="Seconds between polls")] = 1.0,
+    output_format: FormatOption = None,
+) -> None:
+    renderer = _renderer(output_format)
+    for crash_report in DirectoryWatcher(directory, cursor).watch(interval):
+        _print(renderer, crash_report)
+        sys.stdout.flush()
+
+
+@app.command()
+def check(
+    directory: Annotated[Path, typer.Argument(exists=True, file_okay=False)],
+    pattern: Annotated[str, typer.Option(help="Reports to check")] = "**/*.ips",
+) -> None:
+    # parses every field of every report and prints the failures by class
+    summary = summarize_errors(
+        get_crash_reports_from_directory(directory, pattern, tolerant=True)
+    )
+    for (field, error), count in summary.most_common():
+        print(f"{count:>6} {field} {error}")
+
+
+@app.command()
+def serve(
+    host: Annotated[str, typer.Option(help="Listen address")] = "127.0.0.1",
+    port: Annotated[int, typer.Option()] = 8080,
+    workers: Annotated[
+        Optional[int], typer.Option(help="Parsing workers, one per CPU by default")
+    ] = None,
+    threads: Annotated[
+        bool, typer.Option(help="Parse on threads rather than processes")
+    ] = False,
+    max_pending: Annotated[
+        int, typer.Option(help="Reports queued or parsing before rejecting with 503")
+    ] = 64,
+    max_request_size: Annotated[
+        int, typer.Option(help="Largest accepted upload, in bytes")
+    ] = server.MAX_REQUEST_SIZE,
+) -> None:
+    # POST a report to /parse for its fields as JSON, GET /metrics for throughput
+    server.serve(host, port, workers, threads, max_pending, max_request_size)
+
+
+@app.command()
+def compare(
+    before: Annotated[Path, typer.Argument(exists=True, file_okay=False)],
+    after: Annotated[Path, typer.Argument(exists=True, file_okay=False)],
+    min_rate_change: Annotated[
+        float, typer.Option(help="Relative frequency change to report")
+    ] = 0.5,
+) -> None:
+    deltas = compare_corpora(
+        get_crash_reports_from_directory(before),
+        get_crash_reports_from_directory(after),
+        min_rate_change=min_rate_change,
+    )
+    for delta in sorted(deltas, key=lambda delta: (delta.status, -delta.after)):
+        print(
+            f"{delta.status:<12} {delta.before:>6} ({delta.before_rate:6.1%}) -> "
+            f"{delta.after:>6} ({delta.after_rate:6.1%})  {delta.signature}"
+        )
+
+
+def _report_paths(directory: Path) -> List[Path]:
+    paths = {path for pattern in REPORT_PATTERNS for path in directory.glob(pattern)}
+    return [path for path in sorted(paths) if path.is_file()]
+
+
+@app.command()
+def export(
+    directory: Annotated[Path, typer.Argument(exists=True, file_okay=False)],
+    output: Annotated[Path, typer.Argument(file_okay=False)],
+    output_format: Annotated[
+        ExportFormat, typer.Option("--format")
+    ] = ExportFormat.PARQUET,
+    batch_size: Annotated[
+        int, typer.Option(help="Rows per table held before writing a row group")
+    ] = DEFAULT_BATCH_SIZE,
+    tolerant: Annotated[
+        bool, typer.Option(help="Export what could be parsed of malformed reports")
+    ] = False,
+) -> None:
+    # one file per table (metadata, exception, frames, registers, panic, kexts)
+    row_counts = export_crash_reports(
+        get_crash_reports_from_paths(
+            _report_paths(directory), projection=(), tolerant=tolerant
+        ),
+        output,
+        output_format,
+        batch_size,
+    )
+    for table, count in row_counts.items():
+        print(f"{count:>8} {output / f'{table}.{output_format.value}'}")
+
+
+@app.command()
+def summary(
+    directory: Annotated[Path, typer.Argument(exists=True, file_okay=False)],
+    by: Annotated[
+        str, typer.Option(help="Field to estimate the counts of")
+    ] = "exception_type",
+    per_stratum: Annotated[
+        int, typer.Option(help="Reports parsed per (bug_type, name) stratum")
+    ] = DEFAULT_PER_STRATUM,
+    where: Annotated[
+        Optional[str], typer.Option(help="Only reports matching this filter")
+    ] = None,
+    seed: Annotated[Optional[int], typer.Option()] = None,
+    top: Annotated[int, typer.Option(help="Strata and values to print")] = 20,
+) -> None:
+    # exact counts per stratum from the metadata lines, and estimated counts of a
+    # field from a sample of each stratum
+    if by not in METADATA_FIELDS and by not in BODY_FIELDS:
+        raise typer.BadParameter(f"unknown field: {by}", param_hint="--by")
+    sampler = StratifiedSampler(per_stratum, seed, where)
+    sampler.add_paths(_report_paths(directory), tolerant=True)
+    sample = sampler.parse(tolerant=True)
+    print(
+        f"{sample.population} reports in {len(sample.strata)} strata, "
+        f"{sample.sampled} parsed, {sampler.unreadable} unreadable"
+    )
+    for (bug_type, name), count in sample.stratum_counts().most_common(top):
+        print(f"{count:>8} {bug_type} {name}")
+
+    getter = METADATA_FIELDS.get(by)
+    estimates = sample.estimate_counts(
+        (lambda report: getter(report.metadata))
+        if getter is not None
+        else (lambda report: getattr(report, by, None))
+    )
+    print(f"\n{by}, estimated ({sample.confidence:.0%} confidence):")
+    for value, estimate in sorted(estimates.items(), key=lambda item: -item[1].count)[
+        :top
+    ]:
+        print(f"{estimate.count:>8.0f} ± {estimate.error:<6.0f} {value}")
 
 
 def cli() -> None:
-    typer.run(main)
+    try:
+        app()
+    except BrokenPipeError:
+        # the reader went away, e.g. `pycrashreport *.ips | head`: silence the
+        # flush python attempts at exit as well
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
 
 
 if __name__ == "__main__":
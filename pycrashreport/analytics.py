@@ -0,0 +1,268 @@
+import math
+import posixpath
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pycrashreport.crash_report import (
+    CrashReportBase,
+    KernelModeCrashReport,
+    UserModeCrashReport,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+MISSING_TIMESTAMP = -(2**63)
+INT64_MAX = 2**63 - 1
+MICROSECONDS_PER_SECOND = 1000000
+
+
+def _exception_type(report: CrashReportBase) -> Optional[str]:
+    if isinstance(report, UserModeCrashReport):
+        return report.exception_type
+    return None
+
+
+def _panic_string(report: CrashReportBase) -> Optional[str]:
+    if isinstance(report, KernelModeCrashReport):
+        return report.panic_string
+    return None
+
+
+def _top_image(report: CrashReportBase) -> Optional[str]:
+    if isinstance(report, UserModeCrashReport) and report.frames:
+        image_name = report.frames[0].image_name
+        return posixpath.basename(image_name) if image_name else None
+    return None
+
+
+STRING_COLUMNS: Dict[str, Callable[[CrashReportBase], Optional[str]]] = {
+    "bug_type": lambda report: report.bug_type_str,
+    "name": lambda report: report.name,
+    "os_version": lambda report: report.metadata.get("os_version"),
+    "exception_type": _exception_type,
+    "panic_string": _panic_string,
+    "top_image": _top_image,
+}
+
+
+def _timestamp(report: CrashReportBase) -> int:
+    # a malformed timestamp is missing from its own row, not fatal to the batch
+    if not report.metadata.get("timestamp"):
+        return MISSING_TIMESTAMP
+    try:
+        timestamp = report.epoch_microseconds
+    except (TypeError, ValueError):
+        return MISSING_TIMESTAMP
+    # tolerant reports record the failure and return None
+    return MISSING_TIMESTAMP if timestamp is None else timestamp
+
+
+class Column:
+    # dictionary encoded strings: group-bys only ever touch the integer codes, -1 is null
+    def __init__(self, codes: Sequence[int], categories: List[str]):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def encode(cls, values: Iterable[Optional[str]]) -> "Column":
+        mapping = {}
+        codes = array("q")
+        for value in values:
+            if value is None:
+                codes.append(-1)
+            else:
+                codes.append(mapping.setdefault(value, len(mapping)))
+        return cls(_to_vector(codes), list(mapping))
+
+    def decode(self, code: int) -> Optional[str]:
+        return None if code < 0 else self.categories[code]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+def _to_vector(values: array):
+    if np is None:
+        return values
+    return (
+        np.frombuffer(values, dtype=np.int64) if len(values) else np.zeros(0, np.int64)
+    )
+
+
+class ReportTable:
+    def __init__(
+        self,
+        columns: Dict[str, Column],
+        timestamps: Sequence[int],
+        frame_reports: Sequence[int],
+        frame_images: Column,
+        frame_offsets: Sequence[int],
+    ):
+        self.columns = columns
+        self.timestamps = timestamps
+        # exploded faulting-thread frames of user mode reports, one row per frame
+        self.frame_reports = frame_reports
+        self.frame_images = frame_images
+        self.frame_offsets = frame_offsets
+
+    @classmethod
+    def from_reports(cls, reports: Iterable[CrashReportBase]) -> "ReportTable":
+        values = {name: [] for name in STRING_COLUMNS}
+        timestamps = array("q")
+        frame_reports = array("q")
+        frame_images = []
+        frame_offsets = array("q")
+
+        for i, report in enumerate(reports):
+            for name, getter in STRING_COLUMNS.items():
+                values[name].append(getter(report))
+            timestamps.append(_timestamp(report))
+            if isinstance(report, UserModeCrashReport):
+                for frame in report.frames:
+                    if frame.image_offset is None:
+                        continue
+                    frame_reports.append(i)
+                    frame_images.append(
+                        posixpath.basename(frame.image_name)
+                        if frame.image_name
+                        else None
+                    )
+                    frame_offsets.append(frame.image_offset)
+
+        return cls(
+            {name: Column.encode(column) for name, column in values.items()},
+            _to_vector(timestamps),
+            _to_vector(frame_reports),
+            Column.encode(frame_images),
+            _to_vector(frame_offsets),
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def count_by(self, *names: str) -> Counter:
+        columns = [self.columns[name] for name in names]
+        radix_product = math.prod(len(column.categories) + 1 for column in columns)
+        if np is not None and len(self) and radix_product > INT64_MAX:
+            # too many combinations for a single int64 key: unique rows of the codes
+            rows, counts = np.unique(
+                np.stack([column.codes for column in columns], axis=1),
+                axis=0,
+                return_counts=True,
+            )
+            return Counter(
+                {
+                    tuple(
+                        column.decode(code) for column, code in zip(columns, row)
+                    ): count
+                    for row, count in zip(rows.tolist(), counts.tolist())
+                }
+            )
+        if np is not None and len(self):
+            # fold the per-column codes into a single mixed-radix key
+            key = np.zeros(len(self), dtype=np.int64)
+            for column in columns:
+                key = key * (len(column.categories) + 1) + (column.codes + 1)
+            unique, counts = np.unique(key, return_counts=True)
+            result = Counter()
+            for combined, count in zip(unique.tolist(), counts.tolist()):
+                codes = []
+                for column in reversed(columns):
+                    combined, code = divmod(combined, len(column.categories) + 1)
+                    codes.append(code - 1)
+                group = tuple(
+                    column.decode(code)
+                    for column, code in zip(columns, reversed(codes))
+                )
+                result[group] = count
+            return result
+
+        counts = Counter(zip(*(column.codes for column in columns)))
+        return Counter(
+            {
+                tuple(
+                    column.decode(code) for column, code in zip(columns, group)
+                ): count
+                for group, count in counts.items()
+            }
+        )
+
+    def top_crashers(
+        self, by: Tuple[str, ...] = ("name", "exception_type"), n: int = 10
+    ) -> List[Tuple[Tuple[Optional[str], ...], int]]:
+        return self.count_by(*by).most_common(n)
+
+    def crash_rate(self, window: float) -> List[Tuple[int, int]]:
+        # (window start in epoch microseconds, number of reports) for each non-empty window
+        window_size = int(window * MICROSECONDS_PER_SECOND)
+        if np is not None:
+            timestamps = self.timestamps[self.timestamps != MISSING_TIMESTAMP]
+            starts, counts = np.unique(
+                timestamps // window_size * window_size, return_counts=True
+            )
+            return list(zip(starts.tolist(), counts.tolist()))
+
+        counts = Counter(
+            timestamp // window_size * window_size
+            for timestamp in self.timestamps
+            if timestamp != MISSING_TIMESTAMP
+        )
+        return sorted(counts.items())
+
+    def image_offset_histogram(
+        self, image_name: str, bin_size: int = 0x1000
+    ) -> List[Tuple[int, int]]:
+        # (bin start offset, number of frames) for frames inside the given image
+        try:
+            code = self.frame_images.categories.index(image_name)
+        except ValueError:
+            return []
+        if np is not None:
+            offsets = self.frame_offsets[self.frame_images.codes == code]
+            starts, counts = np.unique(
+                offsets // bin_size * bin_size, return_counts=True
+            )
+            return list(zip(starts.tolist(), counts.tolist()))
+
+        counts = Counter(
+            offset // bin_size * bin_size
+            for image, offset in zip(self.frame_images.codes, self.frame_offsets)
+            if image == code
+        )
+        return sorted(counts.items())
+
+    def to_pandas(self):
+        import pandas as pd
+
+        data = {
+            name: pd.Categorical.from_codes(column.codes, column.categories)
+            for name, column in self.columns.items()
+        }
+        timestamps = pd.Series(self.timestamps)
+        data["timestamp"] = pd.to_datetime(
+            timestamps.where(timestamps != MISSING_TIMESTAMP), unit="us", utc=True
+        )
+        return pd.DataFrame(data)
+
+    def to_arrow(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        arrays = {}
+        for name, column in self.columns.items():
+            codes = pa.array(column.codes, type=pa.int64())
+            arrays[name] = pa.DictionaryArray.from_arrays(
+                pc.if_else(pc.less(codes, 0), pa.scalar(None, pa.int64()), codes),
+                pa.array(column.categories, type=pa.string()),
+            )
+        timestamps = pa.array(self.timestamps, type=pa.int64())
+        arrays["timestamp"] = pc.if_else(
+            pc.equal(timestamps, MISSING_TIMESTAMP),
+            pa.scalar(None, pa.timestamp("us", tz="UTC")),
+            timestamps.cast(pa.timestamp("us", tz="UTC")),
+        )
+        return pa.table(arrays)
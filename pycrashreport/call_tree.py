@@ -0,0 +1,123 @@
+import re
+from dataclasses import dataclass, field
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# `<indent>[*]<samples>  <frame> [<address>] [<sample range or state>]`
+CALL_TREE_LINE = re.compile(r"( *)\*?(\d+) {1,2}(\S.*)")
+THREAD_HEADER_PREFIX = "Thread 0x"
+
+
+@dataclass
+class CallTreeNode:
+    name: str
+    count: int = 0
+    children: Dict[str, "CallTreeNode"] = field(default_factory=dict)
+
+    def child(self, name: str) -> "CallTreeNode":
+        node = self.children.get(name)
+        if node is None:
+            node = CallTreeNode(name)
+            self.children[name] = node
+        return node
+
+    def merge(self, other: "CallTreeNode") -> "CallTreeNode":
+        pending = [(self, other)]
+        while pending:
+            destination, source = pending.pop()
+            destination.count += source.count
+            for name, source_child in source.children.items():
+                pending.append((destination.child(name), source_child))
+        return self
+
+    def walk(self) -> Iterator[Tuple[int, "CallTreeNode"]]:
+        pending = [(0, self)]
+        while pending:
+            depth, node = pending.pop()
+            yield depth, node
+            # lightest first so that the heaviest child is popped next
+            for child in sorted(node.children.values(), key=lambda n: n.count):
+                pending.append((depth + 1, child))
+
+    def heaviest_path(self) -> List["CallTreeNode"]:
+        result = []
+        node = self
+        while node.children:
+            node = max(node.children.values(), key=lambda n: n.count)
+            result.append(node)
+        return result
+
+
+def frame_key(frame: str) -> str:
+    # addresses and sample ranges differ between reports, the symbol and image offset do not
+    return frame.split(" [0x", 1)[0].rstrip()
+
+
+class CallTreeBuilder:
+    def __init__(self, root: Optional[CallTreeNode] = None):
+        self.root = root if root is not None else CallTreeNode("<root>")
+        self._stack: List[Tuple[int, CallTreeNode]] = []
+        self._in_thread = False
+
+    def feed(self, line: str) -> None:
+        stripped = line.strip()
+        if not stripped:
+            self._in_thread = False
+            self._stack.clear()
+            return
+
+        if stripped.startswith(THREAD_HEADER_PREFIX):
+            self._in_thread = True
+            self._stack.clear()
+            return
+
+        if not self._in_thread:
+            return
+
+        match = CALL_TREE_LINE.match(line.rstrip("\n"))
+        if match is None:
+            return
+
+        indent = len(match.group(1))
+        count = int(match.group(2))
+        stack = self._stack
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        if stack:
+            parent = stack[-1][1]
+        else:
+            parent = self.root
+            self.root.count += count
+        node = parent.child(frame_key(match.group(3)))
+        node.count += count
+        stack.append((indent, node))
+
+    def feed_lines(self, lines: Iterable[str]) -> CallTreeNode:
+        for line in lines:
+            self.feed(line)
+        return self.root
+
+    def feed_text(self, text: str) -> CallTreeNode:
+        # one line at a time, without a list of every line of a large report
+        start = 0
+        while start < len(text):
+            end = text.find("\n", start)
+            if end == -1:
+                end = len(text)
+            self.feed(text[start:end])
+            start = end + 1
+        return self.root
+
+
+def get_call_tree_from_file(
+    crash_report_file: IO, root: Optional[CallTreeNode] = None
+) -> CallTreeNode:
+    # skip the metadata line and stream the body, never holding more than one line
+    crash_report_file.readline()
+    return CallTreeBuilder(root).feed_lines(crash_report_file)
+
+
+def aggregate_call_trees(crash_report_files: Iterable[IO]) -> CallTreeNode:
+    root = CallTreeNode("<root>")
+    for crash_report_file in crash_report_files:
+        get_call_tree_from_file(crash_report_file, root)
+    return root
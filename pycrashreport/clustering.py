@@ -0,0 +1,152 @@
+import random
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pycrashreport.crash_report import KernelModeCrashReport
+
+# volatile tokens, most specific first: one combined pattern, dispatched on `lastgroup`
+VOLATILE_TOKEN = re.compile(
+    r"(?P<uuid>\b[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}\b)"
+    r"|(?P<address>\b0x[0-9a-fA-F]+\b|\b[0-9a-fA-F]{16}\b)"
+    r"|(?P<cpu>\bcpu \d+)"
+    r"|(?P<number>\b\d+(?:\.\d+)?\b)"
+    # instance numbers of lowercase device names: i2c3, spi0, zone17
+    r"|(?P<instance>(?<=[a-z_])\d+\b)"
+)
+MASKS = {
+    "uuid": "<uuid>",
+    "address": "<addr>",
+    "cpu": "cpu <n>",
+    "number": "<n>",
+    "instance": "<n>",
+}
+TOKEN = re.compile(r"<\w+>|\w+|[^\w\s]")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def _mask(match: re.Match) -> str:
+    return MASKS[match.lastgroup]
+
+
+def normalize_panic_string(panic_string: str) -> str:
+    return VOLATILE_TOKEN.sub(_mask, panic_string).strip()
+
+
+@dataclass
+class PanicCluster:
+    id: int
+    # the first normalized panic string of the cluster
+    representative: str
+    signature: Tuple[int, ...]
+    # panics, and distinct normalized panic strings, assigned to the cluster
+    size: int = 0
+    variants: int = 0
+
+
+class PanicClusterer:
+    # incremental: identical normalized strings share an exact bucket, new ones are
+    # matched to a cluster through MinHash signatures indexed by LSH bands, so each
+    # panic is compared against a few candidates rather than every cluster
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        generator = random.Random(seed)
+        self._permutations = [
+            (
+                generator.randrange(1, _MERSENNE_PRIME),
+                generator.randrange(_MERSENNE_PRIME),
+            )
+            for _ in range(num_perm)
+        ]
+        self.clusters: List[PanicCluster] = []
+        self._exact: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.clusters)
+
+    def __iter__(self) -> Iterator[PanicCluster]:
+        return iter(self.clusters)
+
+    def signature(self, normalized: str) -> Tuple[int, ...]:
+        tokens = TOKEN.findall(normalized)
+        # single tokens and adjacent pairs, so that word order counts a little
+        hashes = {zlib.crc32(token.encode()) for token in tokens}
+        hashes.update(
+            zlib.crc32(f"{first} {second}".encode())
+            for first, second in zip(tokens, tokens[1:])
+        )
+        if not hashes:
+            hashes = {0}
+        return tuple(
+            min((a * value + b) % _MERSENNE_PRIME for value in hashes)
+            for a, b in self._permutations
+        )
+
+    def _bands(
+        self, signature: Tuple[int, ...]
+    ) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows : (band + 1) * self.rows]
+
+    @staticmethod
+    def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        # estimates the Jaccard similarity of the token sets
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+
+    def add(self, panic_string: str) -> PanicCluster:
+        normalized = normalize_panic_string(panic_string)
+        cluster_id = self._exact.get(normalized)
+        if cluster_id is not None:
+            cluster = self.clusters[cluster_id]
+            cluster.size += 1
+            return cluster
+
+        signature = self.signature(normalized)
+        band_keys = list(self._bands(signature))
+        best: Optional[PanicCluster] = None
+        best_similarity = self.threshold
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self._buckets.get(key, ()))
+        for candidate in candidates:
+            cluster = self.clusters[candidate]
+            similarity = self.similarity(signature, cluster.signature)
+            if similarity >= best_similarity:
+                best, best_similarity = cluster, similarity
+
+        if best is None:
+            best = PanicCluster(
+                id=len(self.clusters), representative=normalized, signature=signature
+            )
+            self.clusters.append(best)
+        best.size += 1
+        best.variants += 1
+        self._exact[normalized] = best.id
+        for key in band_keys:
+            self._buckets.setdefault(key, set()).add(best.id)
+        return best
+
+    def add_report(self, crash_report: KernelModeCrashReport) -> PanicCluster:
+        return self.add(crash_report.panic_string or "")
+
+
+def cluster_panics(
+    crash_reports: Iterable[KernelModeCrashReport], **kwargs
+) -> PanicClusterer:
+    clusterer = PanicClusterer(**kwargs)
+    for crash_report in crash_reports:
+        clusterer.add_report(crash_report)
+    return clusterer
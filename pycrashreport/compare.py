@@ -0,0 +1,167 @@
+import os
+import posixpath
+import tempfile
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import IO, Iterable, Iterator, List, Optional
+
+from pycrashreport.crash_report import (
+    CrashReportBase,
+    KernelModeCrashReport,
+    UserModeCrashReport,
+)
+
+FRAME_COUNT = 5
+
+
+def _frame_signature(frame) -> str:
+    image_name = posixpath.basename(frame.image_name) if frame.image_name else "???"
+    if frame.symbol is not None:
+        return f"{image_name}!{frame.symbol}"
+    # offsets are stable across devices for the same build, unlike absolute addresses
+    return f"{image_name}+0x{frame.image_offset or 0:x}"
+
+
+def crash_signature(
+    crash_report: CrashReportBase, frame_count: int = FRAME_COUNT
+) -> str:
+    if isinstance(crash_report, UserModeCrashReport):
+        frames = " > ".join(
+            _frame_signature(frame) for frame in crash_report.frames[:frame_count]
+        )
+        return f"{crash_report.name}: {crash_report.exception_type} @ {frames}"
+    if isinstance(crash_report, KernelModeCrashReport):
+        kexts = ",".join(
+            extension.name for extension in crash_report.kernel_extensions_in_backtrace
+        )
+        return f"panic: {crash_report.panic_string} [{kexts}]"
+    return f"{crash_report.bug_type_str}: {crash_report.name}"
+
+
+@dataclass(frozen=True)
+class SignatureDelta:
+    signature: str
+    before: int
+    after: int
+    before_total: int
+    after_total: int
+
+    @property
+    def before_rate(self) -> float:
+        return self.before / self.before_total if self.before_total else 0.0
+
+    @property
+    def after_rate(self) -> float:
+        return self.after / self.after_total if self.after_total else 0.0
+
+    @property
+    def status(self) -> str:
+        if not self.before:
+            return "appeared"
+        if not self.after:
+            return "disappeared"
+        return "changed"
+
+
+class PartitionedCounter:
+    # counts signatures in memory until `max_keys` distinct ones are held, then spills
+    # them into hash partitions on disk so that each partition can be joined on its own
+    def __init__(self, directory: str, name: str, partitions: int, max_keys: int):
+        self.directory = directory
+        self.name = name
+        self.partitions = partitions
+        self.max_keys = max_keys
+        self.total = 0
+        self._counts = Counter()
+        self._files: List[Optional[IO]] = [None] * partitions
+
+    def _partition(self, signature: str) -> int:
+        return zlib.crc32(signature.encode()) % self.partitions
+
+    def _file(self, partition: int) -> IO:
+        file = self._files[partition]
+        if file is None:
+            file = open(
+                os.path.join(self.directory, f"{self.name}.{partition}"),
+                "w+",
+                encoding="utf-8",
+            )
+            self._files[partition] = file
+        return file
+
+    def add(self, signature: str, count: int = 1) -> None:
+        self.total += count
+        self._counts[signature] += count
+        if len(self._counts) >= self.max_keys:
+            self.spill()
+
+    def spill(self) -> None:
+        for signature, count in self._counts.items():
+            # signatures never contain raw newlines: escape them just in case
+            self._file(self._partition(signature)).write(
+                f"{count}\t{signature.encode('unicode_escape').decode()}\n"
+            )
+        self._counts.clear()
+
+    def partition(self, partition: int) -> Counter:
+        result = Counter(
+            {
+                signature: count
+                for signature, count in self._counts.items()
+                if self._partition(signature) == partition
+            }
+        )
+        file = self._files[partition]
+        if file is not None:
+            file.seek(0)
+            for line in file:
+                count, signature = line.rstrip("\n").split("\t", 1)
+                result[signature.encode().decode("unicode_escape")] += int(count)
+        return result
+
+    def close(self) -> None:
+        for file in self._files:
+            if file is not None:
+                file.close()
+
+
+def compare_corpora(
+    before: Iterable[CrashReportBase],
+    after: Iterable[CrashReportBase],
+    min_rate_change: float = 0.5,
+    partitions: int = 16,
+    max_keys: int = 100000,
+) -> Iterator[SignatureDelta]:
+    # a grace hash join on crash signatures: both sides are consumed as streams and
+    # only one partition of distinct signatures is held in memory while joining
+    with tempfile.TemporaryDirectory(prefix="pycrashreport-compare-") as directory:
+        sides = (
+            PartitionedCounter(directory, "before", partitions, max_keys),
+            PartitionedCounter(directory, "after", partitions, max_keys),
+        )
+        try:
+            for side, crash_reports in zip(sides, (before, after)):
+                for crash_report in crash_reports:
+                    side.add(crash_signature(crash_report))
+
+            before_side, after_side = sides
+            for partition in range(partitions):
+                before_counts = before_side.partition(partition)
+                after_counts = after_side.partition(partition)
+                for signature in before_counts.keys() | after_counts.keys():
+                    delta = SignatureDelta(
+                        signature=signature,
+                        before=before_counts[signature],
+                        after=after_counts[signature],
+                        before_total=before_side.total,
+                        after_total=after_side.total,
+                    )
+                    if delta.before and delta.after:
+                        change = abs(delta.after_rate - delta.before_rate)
+                        if change < min_rate_change * delta.before_rate:
+                            continue
+                    yield delta
+        finally:
+            for side in sides:
+                side.close()
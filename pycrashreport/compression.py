@@ -0,0 +1,61 @@
+import gzip
+import io
+import lzma
+from contextlib import contextmanager
+from typing import IO, Callable, Dict, Iterator
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# archived corpora keep the `.ips` suffix underneath the compression one
+COMPRESSED_SUFFIXES = (".gz", ".xz", ".zst")
+
+
+def _zstd_reader(file: IO[bytes]) -> IO[bytes]:
+    if zstandard is None:
+        raise ValueError("zstandard is required for .zst reports")
+    return zstandard.ZstdDecompressor().stream_reader(
+        file, read_across_frames=True, closefd=False
+    )
+
+
+DECOMPRESSORS: Dict[bytes, Callable[[IO[bytes]], IO[bytes]]] = {
+    GZIP_MAGIC: lambda file: gzip.GzipFile(fileobj=file, mode="rb"),
+    XZ_MAGIC: lambda file: lzma.LZMAFile(file, mode="rb"),
+    ZSTD_MAGIC: _zstd_reader,
+}
+_MAGIC_SIZE = max(len(magic) for magic in DECOMPRESSORS)
+
+
+def decompressing_reader(file: IO[bytes]) -> IO[bytes]:
+    # the format is told by its magic bytes, not by the file name. Decompression is
+    # incremental: reading the metadata line only inflates the first block
+    if not hasattr(file, "peek"):
+        file = io.BufferedReader(file)
+    magic = file.peek(_MAGIC_SIZE)[:_MAGIC_SIZE]
+    for prefix, decompressor in DECOMPRESSORS.items():
+        if magic.startswith(prefix):
+            return decompressor(file)
+    return file
+
+
+@contextmanager
+def open_text(file: IO[bytes], errors: str = "strict") -> Iterator[IO[str]]:
+    # the caller's file stays open: the wrappers created here are detached from it on
+    # exit rather than closing it when they are garbage collected
+    buffered = file if hasattr(file, "peek") else io.BufferedReader(file)
+    text = io.TextIOWrapper(
+        decompressing_reader(buffered), encoding="utf-8", errors=errors
+    )
+    try:
+        yield text
+    finally:
+        text.detach()
+        if buffered is not file:
+            buffered.detach()
@@ -1,19 +1,102 @@
+import itertools
 import json
+import os
 import posixpath
 import re
-from collections import namedtuple
-from dataclasses import dataclass
+import sys
+import threading
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime
 from enum import Enum
-from functools import cached_property
 from io import StringIO
-from typing import IO, List, Mapping, Optional
+from pathlib import Path
+from typing import (
+    IO,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import typer
 
+from pycrashreport.call_tree import (
+    CALL_TREE_LINE,
+    THREAD_HEADER_PREFIX,
+    CallTreeBuilder,
+    CallTreeNode,
+    frame_key,
+)
+from pycrashreport.compression import COMPRESSED_SUFFIXES, open_text
+from pycrashreport.json_projection import loads_projected
+from pycrashreport.registers import Register, RegisterFile
+from pycrashreport.render import OutputFormat, Renderer
+from pycrashreport.report_property import (
+    FieldError,
+    MalformedReportError,
+    report_property,
+)
+from pycrashreport.timestamp import (
+    parse_timestamp,
+    parse_timestamp_epoch,
+    parse_timestamp_naive,
+)
+
 Frame = namedtuple("Frame", "image_name image_base image_offset symbol symbol_offset")
-Register = namedtuple("Register", "name value")
 KernelExtension = namedtuple("KernelExtension", "name version uuid start end")
+SampledFrame = namedtuple("SampledFrame", "samples name")
+Image = namedtuple("Image", "name path uuid arch base size")
+
+LEADING_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+PANIC_FIELD_NAMES = (
+    "Debugger message",
+    "Memory ID",
+    "OS release type",
+    "OS version",
+    "Kernel version",
+    "Fileset Kernelcache UUID",
+    "Kernel UUID",
+    "Boot session UUID",
+    "iBoot version",
+    "secure boot?",
+    "roots installed",
+    "Paniclog version",
+)
+PANIC_HEADER = re.compile(r"panic\(cpu \d+ caller (0x[0-9a-fA-F]+)\): (.+)")
+PANIC_CALLER = re.compile(r" caller (0x[0-9a-fA-F]+)\):")
+# one alternation per panic line kind, dispatched on `match.lastgroup`
+PANIC_LINE = re.compile(
+    r"(?P<field>(?P<field_name>"
+    + "|".join(re.escape(name) for name in PANIC_FIELD_NAMES)
+    + r")[^:]*:(?P<field_value>.*))"
+    r"|(?P<task>Panicked task (?P<task_address>0x[0-9a-fA-F]+): (?P<task_pages>\d+) pages, "
+    r"(?P<task_threads>\d+) threads: pid (?P<task_pid>\d+): (?P<task_name>.+))"
+    r"|(?P<thread>Panicked thread: (?P<thread_address>0x[0-9a-fA-F]+), "
+    r"backtrace: (?P<thread_backtrace>0x[0-9a-fA-F]+), tid: (?P<thread_tid>\d+))"
+    r"|(?P<last_started_kext>last started kext at [^:]*: (?P<last_started_kext_value>.*))"
+    r"|(?P<kexts_in_backtrace>\s*Kernel Extensions in backtrace:\s*$)"
+    r"|(?P<loaded_kexts>loaded kexts:$)"
+)
+# names may hold spaces, and older reports have a "(version)" where newer ones have the
+# architecture: the name ends right before the last word ahead of the UUID
+BINARY_IMAGE = re.compile(
+    r"\s*(0x[0-9a-fA-F]+)\s*-\s*(0x[0-9a-fA-F]+)\s+\+?(.+?)\s+(?:\([^()]*\)|(\S+))\s+"
+    r"<([0-9a-fA-F-]+)>\s*(.*)"
+)
+# bundle ids and versions never hold parentheses: `.+` here backtracks quadratically
+# over lines full of them
+KERNEL_EXTENSION = re.compile(
+    r"([^(]+)\(([^()]+)\)\[([0-9A-F-]+)]@(0x[0-9a-fA-F]+)->(0x[0-9a-fA-F]+)"
+)
 
 
 @dataclass(frozen=True)
@@ -203,12 +286,77 @@ class BugType(Enum):
     HotStopAppLaunchLog = "248"
 
 
+def normalize_uuid(uuid: Optional[str]) -> Optional[str]:
+    # text reports use `<ca63a72de9ee3ba2835b50ddda3fb008>`, JSON ones dashed lowercase
+    if not uuid:
+        return None
+    digits = uuid.replace("-", "").upper()
+    if len(digits) != 32:
+        return uuid.upper()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def _jsonable(value):
+    if isinstance(value, tuple) and hasattr(value, "_asdict"):
+        value = value._asdict()
+    elif is_dataclass(value):
+        value = asdict(value)
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
 class CrashReportBase:
-    def __init__(self, metadata: Mapping, data: str, filename: str = None):
+    # top-level JSON body fields the properties of this class read, see `json_projection`
+    JSON_FIELDS = ()
+    # properties making up `to_dict()`
+    DICT_FIELDS = ("incident_id", "bug_type_str", "name", "timestamp")
+
+    def __init__(
+        self,
+        metadata: Mapping,
+        data: str,
+        filename: str = None,
+        projection: Optional[Collection[str]] = None,
+        tolerant: bool = False,
+    ):
         self.filename = filename
         self._metadata = metadata
         self._data = data
-        self._parse()
+        self._projection = projection
+        # tolerant reports never raise from their properties, see `report_property`
+        self.tolerant = tolerant
+        self.errors: List[FieldError] = []
+        self._lock = threading.RLock()
+        try:
+            self._parse()
+        except Exception as e:
+            if not tolerant:
+                raise
+            self.errors.append(FieldError("body", e))
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def parse_all(self) -> List[FieldError]:
+        # resolves every property, so that `errors` covers the whole report
+        for cls in type(self).__mro__:
+            for name, value in vars(cls).items():
+                if isinstance(value, report_property):
+                    getattr(self, name)
+        return self.errors
 
     def _parse(self):
         self._is_json = False
@@ -218,33 +366,63 @@ class CrashReportBase:
                 modified_data, rest = modified_data.split("\n  \n", 1)
                 rest = '",' + rest.split('",', 1)[1]
                 modified_data += rest
-            self._data = json.loads(modified_data)
+            if self._projection is None:
+                self._data = json.loads(modified_data)
+            else:
+                self._data = loads_projected(
+                    modified_data, (*self.JSON_FIELDS, *self._projection)
+                )
             self._is_json = True
         except json.decoder.JSONDecodeError:
             pass
 
-    @cached_property
+    @property
+    def metadata(self) -> Mapping:
+        return self._metadata
+
+    @report_property
     def bug_type(self) -> BugType:
         return BugType(self.bug_type_str)
 
-    @cached_property
+    @report_property
     def bug_type_str(self) -> str:
         return self._metadata["bug_type"]
 
-    @cached_property
+    @report_property
     def incident_id(self):
         return self._metadata.get("incident_id")
 
-    @cached_property
+    @report_property
     def timestamp(self) -> datetime:
-        timestamp = self._metadata.get("timestamp")
-        timestamp_without_timezone = timestamp.rsplit(" ", 1)[0]
-        return datetime.strptime(timestamp_without_timezone, "%Y-%m-%d %H:%M:%S.%f")
+        return parse_timestamp_naive(self._metadata.get("timestamp"))
 
-    @cached_property
+    @report_property
+    def aware_timestamp(self) -> datetime:
+        return parse_timestamp(self._metadata.get("timestamp"))
+
+    @report_property
+    def epoch_microseconds(self) -> int:
+        return parse_timestamp_epoch(self._metadata.get("timestamp"))
+
+    @report_property
     def name(self) -> str:
         return self._metadata.get("name")
 
+    def to_dict(self) -> Dict:
+        # JSON serializable; on tolerant reports, also lists the fields that failed
+        result = {"filename": self.filename}
+        for name in self.DICT_FIELDS:
+            result[name] = _jsonable(getattr(self, name))
+        result["errors"] = [
+            {
+                "field": error.field,
+                "error": type(error.error).__name__,
+                "message": str(error.error),
+            }
+            for error in self.errors
+        ]
+        return result
+
     def __repr__(self) -> str:
         filename = ""
         if self.filename:
@@ -252,16 +430,41 @@ class CrashReportBase:
         return f"<{self.__class__} {filename}TIMESTAMP:{self.timestamp}>"
 
     def __str__(self) -> str:
+        result = StringIO()
+        Renderer(result, OutputFormat.ANSI).render(self)
+        return result.getvalue()
+
+    def _render(self, renderer: Renderer) -> None:
         filename = ""
         if self.filename:
             filename = self.filename
 
-        return typer.style(
+        renderer.style(
             f"{self.incident_id} {self.timestamp}\n{filename}\n\n", fg=typer.colors.CYAN
         )
 
+    def _compact_summary(self) -> str:
+        return ""
+
 
 class UserModeCrashReport(CrashReportBase):
+    DICT_FIELDS = (
+        *CrashReportBase.DICT_FIELDS,
+        "exception_type",
+        "exception_subtype",
+        "application_specific_information",
+        "faulting_thread",
+        "registers",
+        "frames",
+    )
+    JSON_FIELDS = (
+        "faultingThread",
+        "exception",
+        "asi",
+        "usedImages",
+        "threads[faultingThread]",
+    )
+
     def _parse_field(self, name: str) -> str:
         name += ":"
         for line in self._data.split("\n"):
@@ -270,14 +473,17 @@ class UserModeCrashReport(CrashReportBase):
                 field = field.strip()
                 return field
 
-    @cached_property
+    @report_property
     def faulting_thread(self) -> int:
         if self._is_json:
             return self._data["faultingThread"]
         else:
-            return int(self._parse_field("Triggered by Thread"))
+            value = self._parse_field("Triggered by Thread")
+            if value is None:
+                raise MalformedReportError("missing field: Triggered by Thread")
+            return int(value)
 
-    @cached_property
+    @report_property(default=list)
     def frames(self) -> List[Frame]:
         result = []
         if self._is_json:
@@ -285,9 +491,11 @@ class UserModeCrashReport(CrashReportBase):
             images = self._data["usedImages"]
             for frame in self._data["threads"][thread_index]["frames"]:
                 image = images[frame["imageIndex"]]
+                path = image.get("path")
                 result.append(
                     Frame(
-                        image_name=image.get("path"),
+                        # the same image paths repeat across every report of a corpus
+                        image_name=sys.intern(path) if path is not None else None,
                         image_base=image.get("base"),
                         symbol=frame.get("symbol"),
                         image_offset=frame.get("imageOffset"),
@@ -303,7 +511,8 @@ class UserModeCrashReport(CrashReportBase):
                     if len(splitted) == 0:
                         break
 
-                    assert splitted[-2] == "+"
+                    if len(splitted) < 4 or splitted[-2] != "+":
+                        raise MalformedReportError(f"malformed frame: {line!r}")
                     image_base = splitted[-3]
                     if image_base.startswith("0x"):
                         result.append(
@@ -332,7 +541,53 @@ class UserModeCrashReport(CrashReportBase):
 
         return result
 
-    @cached_property
+    @report_property(default=list)
+    def images(self) -> List[Image]:
+        result = []
+        if self._is_json:
+            for image in self._data["usedImages"]:
+                path = image.get("path")
+                result.append(
+                    Image(
+                        name=image.get("name"),
+                        path=sys.intern(path) if path is not None else None,
+                        uuid=normalize_uuid(image.get("uuid")),
+                        arch=image.get("arch"),
+                        base=image.get("base"),
+                        size=image.get("size"),
+                    )
+                )
+        else:
+            in_images = False
+            for line in self._data.split("\n"):
+                if in_images:
+                    if not line.strip():
+                        # the section ends with a blank line
+                        if result:
+                            break
+                        continue
+                    match = BINARY_IMAGE.match(line)
+                    if match is None:
+                        continue
+                    base = int(match.group(1), 16)
+                    path = match.group(6) or None
+                    result.append(
+                        Image(
+                            name=match.group(3),
+                            path=sys.intern(path) if path is not None else None,
+                            uuid=normalize_uuid(match.group(5)),
+                            arch=match.group(4),
+                            base=base,
+                            size=int(match.group(2), 16) - base + 1,
+                        )
+                    )
+
+                if line.startswith("Binary Images:"):
+                    in_images = True
+
+        return result
+
+    @report_property(default=list)
     def registers(self) -> List[Register]:
         result = []
         if self._is_json:
@@ -347,6 +602,9 @@ class UserModeCrashReport(CrashReportBase):
                     if isinstance(value, dict):
                         result.append(Register(name=name, value=value["value"]))
         else:
+            thread_state_header = (
+                f"Thread {self.faulting_thread} crashed with ARM Thread State"
+            )
             in_frames = False
             for line in self._data.split("\n"):
                 if in_frames:
@@ -367,28 +625,30 @@ class UserModeCrashReport(CrashReportBase):
                             Register(name=register_name, value=register_value)
                         )
 
-                if line.startswith(
-                    f"Thread {self.faulting_thread} crashed with ARM Thread State"
-                ):
+                if line.startswith(thread_state_header):
                     in_frames = True
 
         return result
 
-    @cached_property
+    @report_property
+    def register_file(self) -> RegisterFile:
+        return RegisterFile.from_registers(self.registers)
+
+    @report_property
     def exception_type(self):
         if self._is_json:
             return self._data["exception"].get("type")
         else:
             return self._parse_field("Exception Type")
 
-    @cached_property
+    @report_property
     def exception_subtype(self) -> Optional[str]:
         if self._is_json:
             return self._data["exception"].get("subtype")
         else:
             return self._parse_field("Exception Subtype")
 
-    @cached_property
+    @report_property
     def application_specific_information(self) -> Optional[str]:
         result = ""
         if self._is_json:
@@ -414,45 +674,100 @@ class UserModeCrashReport(CrashReportBase):
             return None
         return result
 
-    def __str__(self) -> str:
-        result = super().__str__()
-        result += typer.style(f"Exception: {self.exception_type}\n", bold=True)
+    def _render(self, renderer: Renderer) -> None:
+        super()._render(renderer)
+        renderer.style(f"Exception: {self.exception_type}\n", bold=True)
 
         if self.exception_subtype:
-            result += typer.style("Exception Subtype: ", bold=True)
-            result += f"{self.exception_subtype}\n"
+            renderer.style("Exception Subtype: ", bold=True)
+            renderer.write(f"{self.exception_subtype}\n")
 
         if self.application_specific_information:
-            result += typer.style("Application Specific Information: ", bold=True)
-            result += str(self.application_specific_information)
+            renderer.style("Application Specific Information: ", bold=True)
+            renderer.write(str(self.application_specific_information))
 
-        result += "\n"
+        renderer.write("\n")
 
-        result += typer.style("Registers:", bold=True)
+        renderer.style("Registers:", bold=True)
         for i, register in enumerate(self.registers):
             if i % 4 == 0:
-                result += "\n"
+                renderer.write("\n")
 
-            result += f"{register.name} = 0x{register.value:016x} ".rjust(30)
+            renderer.write(f"{register.name} = 0x{register.value:016x} ".rjust(30))
 
-        result += "\n\n"
+        renderer.write("\n\n")
 
-        result += typer.style("Frames:\n", bold=True)
+        renderer.style("Frames:\n", bold=True)
         for frame in self.frames:
             image_base = "_HEADER"
             if frame.image_base is not None:
                 image_base = f"0x{frame.image_base:x}"
-            result += f"\t[{frame.image_name}] {image_base}"
+            line = f"\t[{frame.image_name}] {image_base}"
             if frame.image_offset:
-                result += f" + 0x{frame.image_offset:x}"
+                line += f" + 0x{frame.image_offset:x}"
             if frame.symbol is not None:
-                result += f" ({frame.symbol} + 0x{frame.symbol_offset:x})"
-            result += "\n"
-
-        return result
+                line += f" ({frame.symbol} + 0x{frame.symbol_offset:x})"
+            renderer.write(line + "\n")
+
+    def _compact_summary(self) -> str:
+        summary = str(self.exception_type)
+        if self.frames:
+            frame = self.frames[0]
+            image_name = posixpath.basename(frame.image_name or "???")
+            if frame.symbol is not None:
+                summary += f" @ {image_name}!{frame.symbol}"
+            else:
+                summary += f" @ {image_name}+0x{frame.image_offset or 0:x}"
+        return summary
+
+
+def _parse_loaded_kext(line: str) -> KernelExtension:
+    match = KERNEL_EXTENSION.match(line)
+    if match is not None:
+        return KernelExtension(
+            name=sys.intern(match.group(1)),
+            version=match.group(2),
+            uuid=match.group(3),
+            start=int(match.group(4), 16),
+            end=int(match.group(5), 16),
+        )
+    name, _, version = line.partition("\t")
+    if not version:
+        name, _, version = line.partition(" ")
+    return KernelExtension(
+        name=sys.intern(name.strip()),
+        version=version.strip() or None,
+        uuid=None,
+        start=None,
+        end=None,
+    )
 
 
 class KernelModeCrashReport(CrashReportBase):
+    JSON_FIELDS = ("string", "panicString")
+    DICT_FIELDS = (
+        *CrashReportBase.DICT_FIELDS,
+        "panic_string",
+        "panic_caller",
+        "debugger_message",
+        "memory_id",
+        "os_release_type",
+        "os_version",
+        "kernel_version",
+        "fileset_kernelcache_uuid",
+        "kernel_uuid",
+        "boot_session_uuid",
+        "iboot_version",
+        "secure_boot",
+        "roots_installed",
+        "paniclog_version",
+        "panicked_task",
+        "panicked_thread",
+        "kernel_extensions_in_backtrace",
+        "last_started_kext",
+        "loaded_kexts",
+    )
+
     def _parse(self):
         super()._parse()
         self._panic_text = ""
@@ -463,236 +778,597 @@ class KernelModeCrashReport(CrashReportBase):
         elif isinstance(self._data, str):
             self._panic_text = self._data
 
-    def _panic_lines(self) -> List[str]:
-        return self._panic_text.splitlines()
+    @report_property(default=str)
+    def _panic_header(self) -> str:
+        return self._panic_text.split("\n", 1)[0].rstrip("\r")
+
+    @report_property(default=dict)
+    def _panic_fields(self) -> Dict:
+        # classify every line exactly once with the combined scanner; the first
+        # occurrence of each field wins, like a top-down search would
+        fields = {}
+        section = None
+        kexts_in_backtrace = None
+        loaded_kexts = None
+        for line in self._panic_text.splitlines():
+            if section is not None:
+                stripped = line.strip()
+                if not stripped:
+                    section = None
+                elif section is kexts_in_backtrace:
+                    if stripped.startswith("dependency:"):
+                        continue
+                    match = KERNEL_EXTENSION.match(stripped)
+                    if match:
+                        kexts_in_backtrace.append(
+                            KernelExtension(
+                                name=match.group(1),
+                                version=match.group(2),
+                                uuid=match.group(3),
+                                start=int(match.group(4), 16),
+                                end=int(match.group(5), 16),
+                            )
+                        )
+                else:
+                    loaded_kexts.append(stripped)
+                continue
+
+            match = PANIC_LINE.match(line)
+            if match is None:
+                continue
+
+            kind = match.lastgroup
+            if kind == "field":
+                fields.setdefault(match.group("field_name"), match.group("field_value"))
+            elif kind == "task":
+                fields.setdefault("task", match)
+            elif kind == "thread":
+                fields.setdefault("thread", match)
+            elif kind == "last_started_kext":
+                fields.setdefault(kind, match.group("last_started_kext_value"))
+            elif kind == "kexts_in_backtrace":
+                if kexts_in_backtrace is None:
+                    kexts_in_backtrace = section = []
+            elif kind == "loaded_kexts":
+                if loaded_kexts is None:
+                    loaded_kexts = section = []
+
+        fields["kernel_extensions_in_backtrace"] = kexts_in_backtrace or []
+        fields["loaded_kexts"] = loaded_kexts or []
+        return fields
 
     def _line_value(self, prefix: str) -> Optional[str]:
-        for line in self._panic_lines():
-            if line.startswith(prefix):
-                return line.split(":", 1)[1].strip()
-        return None
+        value = self._panic_fields.get(prefix)
+        return value.strip() if value is not None else None
 
-    @cached_property
+    @report_property
     def panic_string(self) -> str:
-        lines = self._panic_lines()
-        if not lines:
-            return ""
-        first_line = lines[0]
-        match = re.match(r"panic\(cpu \d+ caller 0x[0-9a-fA-F]+\): (.+)", first_line)
+        first_line = self._panic_header
+        match = PANIC_HEADER.match(first_line)
         if match:
-            return match.group(1)
+            return match.group(2)
         return first_line
 
-    @cached_property
+    @report_property
     def panic_caller(self) -> Optional[int]:
-        lines = self._panic_lines()
-        if not lines:
-            return None
-        first_line = lines[0]
-        match = re.search(r" caller (0x[0-9a-fA-F]+)\):", first_line)
+        match = PANIC_CALLER.search(self._panic_header)
         if match is None:
             return None
         return int(match.group(1), 16)
 
-    @cached_property
+    @report_property
     def debugger_message(self) -> Optional[str]:
         return self._line_value("Debugger message")
 
-    @cached_property
+    @report_property
     def memory_id(self) -> Optional[int]:
         value = self._line_value("Memory ID")
         return int(value, 16) if value is not None else None
 
-    @cached_property
+    @report_property
     def os_release_type(self) -> Optional[str]:
         return self._line_value("OS release type")
 
-    @cached_property
+    @report_property
     def os_version(self) -> Optional[str]:
         return self._line_value("OS version")
 
-    @cached_property
+    @report_property
     def kernel_version(self) -> Optional[str]:
         return self._line_value("Kernel version")
 
-    @cached_property
+    @report_property
     def fileset_kernelcache_uuid(self) -> Optional[str]:
         return self._line_value("Fileset Kernelcache UUID")
 
-    @cached_property
+    @report_property
     def kernel_uuid(self) -> Optional[str]:
         return self._line_value("Kernel UUID")
 
-    @cached_property
+    @report_property
     def boot_session_uuid(self) -> Optional[str]:
         return self._line_value("Boot session UUID")
 
-    @cached_property
+    @report_property
     def iboot_version(self) -> Optional[str]:
         return self._line_value("iBoot version")
 
-    @cached_property
+    @report_property
     def secure_boot(self) -> Optional[bool]:
         value = self._line_value("secure boot?")
         if value is None:
             return None
         return value == "YES"
 
-    @cached_property
+    @report_property
     def roots_installed(self) -> Optional[int]:
         value = self._line_value("roots installed")
         return int(value) if value is not None else None
 
-    @cached_property
+    @report_property
     def paniclog_version(self) -> Optional[int]:
         value = self._line_value("Paniclog version")
         return int(value) if value is not None else None
 
-    @cached_property
+    @report_property
     def panicked_task(self) -> Optional[PanickedTask]:
-        for line in self._panic_lines():
-            match = re.match(
-                r"Panicked task (0x[0-9a-fA-F]+): (\d+) pages, (\d+) threads: pid (\d+): (.+)",
-                line,
-            )
-            if match:
-                return PanickedTask(
-                    address=int(match.group(1), 16),
-                    pages=int(match.group(2)),
-                    threads=int(match.group(3)),
-                    pid=int(match.group(4)),
-                    name=match.group(5),
-                )
-        return None
+        match = self._panic_fields.get("task")
+        if match is None:
+            return None
+        return PanickedTask(
+            address=int(match.group("task_address"), 16),
+            pages=int(match.group("task_pages")),
+            threads=int(match.group("task_threads")),
+            pid=int(match.group("task_pid")),
+            name=match.group("task_name"),
+        )
 
-    @cached_property
+    @report_property
     def panicked_thread(self) -> Optional[PanickedThread]:
-        for line in self._panic_lines():
-            match = re.match(
-                r"Panicked thread: (0x[0-9a-fA-F]+), backtrace: (0x[0-9a-fA-F]+), tid: (\d+)",
-                line,
-            )
-            if match:
-                return PanickedThread(
-                    address=int(match.group(1), 16),
-                    backtrace=int(match.group(2), 16),
-                    tid=int(match.group(3)),
-                )
-        return None
+        match = self._panic_fields.get("thread")
+        if match is None:
+            return None
+        return PanickedThread(
+            address=int(match.group("thread_address"), 16),
+            backtrace=int(match.group("thread_backtrace"), 16),
+            tid=int(match.group("thread_tid")),
+        )
 
-    @cached_property
+    @report_property(default=list)
     def kernel_extensions_in_backtrace(self) -> List[KernelExtension]:
-        result = []
-        in_section = False
-        for line in self._panic_lines():
-            stripped = line.strip()
-            if stripped == "Kernel Extensions in backtrace:":
-                in_section = True
-                continue
-            if not in_section:
-                continue
-            if not stripped:
-                break
-            if stripped.startswith("dependency:"):
-                continue
-            match = re.match(
-                r"(.+)\((.+)\)\[([0-9A-F-]+)]@(0x[0-9a-fA-F]+)->(0x[0-9a-fA-F]+)",
-                stripped,
-            )
-            if match:
-                result.append(
-                    KernelExtension(
-                        name=match.group(1),
-                        version=match.group(2),
-                        uuid=match.group(3),
-                        start=int(match.group(4), 16),
-                        end=int(match.group(5), 16),
-                    )
-                )
-        return result
+        return self._panic_fields.get("kernel_extensions_in_backtrace", [])
 
-    @cached_property
+    @report_property
     def last_started_kext(self) -> Optional[str]:
-        for line in self._panic_lines():
-            if line.startswith("last started kext at "):
-                return line.split(": ", 1)[1]
-        return None
+        return self._panic_fields.get("last_started_kext")
 
-    @cached_property
+    @report_property(default=list)
     def loaded_kexts(self) -> List[str]:
-        result = []
-        in_section = False
-        for line in self._panic_lines():
-            if line == "loaded kexts:":
-                in_section = True
-                continue
-            if not in_section:
-                continue
-            if not line.strip():
-                break
-            result.append(line.strip())
-        return result
+        return self._panic_fields.get("loaded_kexts", [])
 
-    def __str__(self) -> str:
-        result = super().__str__()
+    @report_property(default=list)
+    def loaded_kernel_extensions(self) -> List[KernelExtension]:
+        # `loaded_kexts` as records. Most panics list only a bundle id and a version:
+        # uuid and addresses are None then
+        return [_parse_loaded_kext(line) for line in self.loaded_kexts]
+
+    def _render(self, renderer: Renderer) -> None:
+        super()._render(renderer)
         if self.panic_string:
-            result += typer.style(f"Panic: {self.panic_string}\n", bold=True)
+            renderer.style(f"Panic: {self.panic_string}\n", bold=True)
         if self.debugger_message:
-            result += typer.style("Debugger message: ", bold=True)
-            result += f"{self.debugger_message}\n"
+            renderer.style("Debugger message: ", bold=True)
+            renderer.write(f"{self.debugger_message}\n")
         if self.panicked_task:
-            result += typer.style("Panicked task: ", bold=True)
-            result += (
+            renderer.style("Panicked task: ", bold=True)
+            renderer.write(
                 f"{self.panicked_task.name} (pid {self.panicked_task.pid}, "
                 f"{self.panicked_task.threads} threads)\n"
             )
         if self.panicked_thread:
-            result += typer.style("Panicked thread: ", bold=True)
-            result += (
+            renderer.style("Panicked thread: ", bold=True)
+            renderer.write(
                 f"tid {self.panicked_thread.tid} @ 0x{self.panicked_thread.address:x}\n"
             )
         if self.kernel_extensions_in_backtrace:
-            result += typer.style("Kernel Extensions in backtrace:\n", bold=True)
+            renderer.style("Kernel Extensions in backtrace:\n", bold=True)
             for extension in self.kernel_extensions_in_backtrace:
-                result += f"\t{extension.name} {extension.version} [{extension.uuid}]\n"
-        return result
+                renderer.write(
+                    f"\t{extension.name} {extension.version} [{extension.uuid}]\n"
+                )
 
-    @cached_property
+    def _compact_summary(self) -> str:
+        return self.panic_string or ""
+
+    @report_property
     def bug_type(self) -> BugType:
         return BugType(self._metadata["bug_type"])
 
 
-def get_crash_report_from_file(crash_report_file: IO) -> CrashReportBase:
-    metadata = json.loads(crash_report_file.readline())
+class StackshotReport(CrashReportBase):
+    DICT_FIELDS = (
+        *CrashReportBase.DICT_FIELDS,
+        "command",
+        "duration",
+        "steps",
+        "heaviest_stacks",
+    )
+
+    def _parse(self):
+        # spindump-style text bodies, never JSON
+        self._is_json = False
 
+    @report_property(default=lambda: ({}, {}))
+    def _header(self):
+        # single pass over everything preceding the first thread section: collects the
+        # `Name: value` fields and the flat "Heaviest stack for ...:" sections together
+        fields = {}
+        heaviest_stacks = {}
+        stack = None
+        for line in StringIO(self._data):
+            line = line.rstrip("\n")
+            if line.lstrip().startswith(THREAD_HEADER_PREFIX):
+                break
+            if stack is not None:
+                match = CALL_TREE_LINE.match(line)
+                if match is not None:
+                    stack.append(
+                        SampledFrame(
+                            samples=int(match.group(2)), name=frame_key(match.group(3))
+                        )
+                    )
+                    continue
+                stack = None
+            if not line or line[0].isspace() or ":" not in line:
+                continue
+            name, value = line.split(":", 1)
+            if name.startswith("Heaviest stack for "):
+                stack = heaviest_stacks.setdefault(
+                    name[len("Heaviest stack for ") :], []
+                )
+                continue
+            fields.setdefault(name, value.strip())
+        return fields, heaviest_stacks
+
+    @report_property(default=dict)
+    def fields(self) -> Dict[str, str]:
+        return self._header[0]
+
+    @report_property(default=dict)
+    def heaviest_stacks(self) -> Dict[str, List[SampledFrame]]:
+        return self._header[1]
+
+    @report_property
+    def command(self) -> Optional[str]:
+        return self.fields.get("Command") or self.fields.get("Process")
+
+    @report_property
+    def duration(self) -> Optional[float]:
+        value = self.fields.get("Duration")
+        return float(value.rstrip("s")) if value is not None else None
+
+    @report_property
+    def steps(self) -> Optional[int]:
+        value = self.fields.get("Steps")
+        return int(value.split(maxsplit=1)[0]) if value is not None else None
+
+    @report_property(default=lambda: CallTreeNode("<root>"))
+    def call_tree(self) -> CallTreeNode:
+        return CallTreeBuilder().feed_text(self._data)
+
+    def _render(self, renderer: Renderer) -> None:
+        super()._render(renderer)
+        if self.command:
+            renderer.style("Command: ", bold=True)
+            renderer.write(f"{self.command}\n")
+        if self.duration is not None:
+            renderer.style("Duration: ", bold=True)
+            renderer.write(f"{self.duration:.2f}s ({self.steps} steps)\n")
+        renderer.style("Heaviest path:\n", bold=True)
+        for node in self.call_tree.heaviest_path():
+            renderer.write(f"\t{node.count:>6} {node.name}\n")
+
+    def _compact_summary(self) -> str:
+        # the header only: building the call tree would walk every thread section
+        summary = str(self.command)
+        if self.duration is not None:
+            summary += f" {self.duration:.2f}s"
+        return summary
+
+
+def _leading_number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    match = LEADING_NUMBER.match(value)
+    return float(match.group(0)) if match else None
+
+
+class ExcResourceReport(StackshotReport):
+    DICT_FIELDS = (
+        *StackshotReport.DICT_FIELDS,
+        "event",
+        "action_taken",
+        "resource",
+        "summary",
+        "limit",
+        "limit_duration",
+        "observed",
+        "observed_duration",
+    )
+
+    @report_property
+    def event(self) -> Optional[str]:
+        return self.fields.get("Event")
+
+    @report_property
+    def action_taken(self) -> Optional[str]:
+        return self.fields.get("Action taken")
+
+    @report_property
+    def resource(self) -> Optional[str]:
+        # "CPU limit", "Wakeups limit", "Writes limit"...
+        for name in self.fields:
+            if name.endswith(" limit"):
+                return name[: -len(" limit")]
+        return None
+
+    @report_property
+    def summary(self) -> Optional[str]:
+        return self.fields.get(self.resource) if self.resource else None
+
+    @report_property
+    def limit(self) -> Optional[float]:
+        if self.resource is None:
+            return None
+        return _leading_number(self.fields.get(f"{self.resource} limit"))
+
+    @report_property
+    def limit_duration(self) -> Optional[float]:
+        return _leading_number(self.fields.get("Limit duration"))
+
+    @report_property
+    def observed(self) -> Optional[float]:
+        if self.resource is None:
+            return None
+        return _leading_number(
+            self.fields.get(f"{self.resource} used")
+            or self.fields.get(f"{self.resource} caused")
+        )
+
+    @report_property
+    def observed_duration(self) -> Optional[float]:
+        if self.resource is None:
+            return None
+        return _leading_number(self.fields.get(f"{self.resource} duration"))
+
+    def _render(self, renderer: Renderer) -> None:
+        CrashReportBase._render(self, renderer)
+        renderer.style(f"Event: {self.event}\n", bold=True)
+        if self.command:
+            renderer.style("Command: ", bold=True)
+            renderer.write(f"{self.command}\n")
+        if self.summary:
+            renderer.style(f"{self.resource}: ", bold=True)
+            renderer.write(f"{self.summary}\n")
+        if self.action_taken:
+            renderer.style("Action taken: ", bold=True)
+            renderer.write(f"{self.action_taken}\n")
+        for title, stack in self.heaviest_stacks.items():
+            renderer.style(f"Heaviest stack for {title}:\n", bold=True)
+            for frame in stack:
+                renderer.write(f"\t{frame.samples:>6} {frame.name}\n")
+
+    def _compact_summary(self) -> str:
+        return f"{self.command}: {self.summary or self.event}"
+
+
+BUG_TYPE_PARSERS = {
+    BugType.ForceReset: KernelModeCrashReport,
+    BugType.Panic_210: KernelModeCrashReport,
+    BugType.Crash_109: UserModeCrashReport,
+    BugType.Crash_309: UserModeCrashReport,
+    BugType.ExcResourceThreads_327: ExcResourceReport,
+    BugType.ExcResource_385: ExcResourceReport,
+    BugType.Stackshot: StackshotReport,
+    BugType.HangSpin: StackshotReport,
+    BugType.Spin: StackshotReport,
+    BugType.MicroStackshot: StackshotReport,
+    BugType.MicroRunloopHang: StackshotReport,
+    BugType.ShortRunloopHang: StackshotReport,
+    BugType.LongRunloopHang: StackshotReport,
+}
+
+
+def _select_parser(metadata: Mapping) -> type:
     try:
-        bug_type = BugType(metadata["bug_type"])
+        return BUG_TYPE_PARSERS.get(BugType(metadata["bug_type"]), CrashReportBase)
     except ValueError:
-        return CrashReportBase(
-            metadata, crash_report_file.read(), crash_report_file.name
+        return CrashReportBase
+
+
+METADATA_CHUNK_SIZE = 64
+
+REPORT_PATTERNS = (
+    "**/*.ips",
+    *(f"**/*.ips{suffix}" for suffix in COMPRESSED_SUFFIXES),
+)
+
+
+def _text_errors(tolerant: bool) -> str:
+    # undecodable bytes are replaced in tolerant mode rather than failing the read
+    return "replace" if tolerant else "strict"
+
+
+def get_crash_report_from_file(
+    crash_report_file: IO,
+    projection: Optional[Collection[str]] = None,
+    tolerant: bool = False,
+    metadata_filter: Optional[Callable[[Mapping], bool]] = None,
+) -> Optional[CrashReportBase]:
+    # `projection`: additional top-level JSON body fields to decode on top of the
+    # ones the parser needs. Everything else is skipped without building python
+    # objects. None decodes the whole body.
+    #
+    # `tolerant`: malformed reports are returned as far as they could be parsed, with
+    # what failed recorded in `errors` instead of raised.
+    #
+    # `metadata_filter`: called with the metadata line before the body is read or
+    # decompressed. None is returned for reports it rejects, see `filters`.
+    #
+    # binary files may be gzip, xz or zstd compressed, see `compression`
+    filename = getattr(crash_report_file, "name", None)
+    # text handles are told by what they read, not by their class: e.g. temporary
+    # files opened in text mode are not `TextIOBase` instances
+    if isinstance(crash_report_file.read(0), str):
+        return _get_crash_report_from_text(
+            crash_report_file, filename, projection, tolerant, metadata_filter
         )
+    with open_text(crash_report_file, _text_errors(tolerant)) as text_file:
+        return _get_crash_report_from_text(
+            text_file, filename, projection, tolerant, metadata_filter
+        )
+
 
-    bug_type_parsers = {
-        BugType.ForceReset: KernelModeCrashReport,
-        BugType.Panic_210: KernelModeCrashReport,
-        BugType.Crash_109: UserModeCrashReport,
-        BugType.Crash_309: UserModeCrashReport,
-        BugType.ExcResourceThreads_327: UserModeCrashReport,
-        BugType.ExcResource_385: UserModeCrashReport,
-    }
-
-    parser = bug_type_parsers.get(bug_type)
-    if parser is None:
-        return CrashReportBase(
-            metadata, crash_report_file.read(), crash_report_file.name
+def _get_crash_report_from_text(
+    crash_report_file: IO[str],
+    filename: Optional[str],
+    projection: Optional[Collection[str]],
+    tolerant: bool,
+    metadata_filter: Optional[Callable[[Mapping], bool]],
+) -> Optional[CrashReportBase]:
+    try:
+        metadata = json.loads(crash_report_file.readline())
+        parser = _select_parser(metadata)
+    except Exception as e:
+        if not tolerant:
+            raise
+        if metadata_filter is not None and not metadata_filter({}):
+            return None
+        crash_report = CrashReportBase(
+            {}, crash_report_file.read(), filename, projection, True
         )
+        crash_report.errors.insert(0, FieldError("metadata", e))
+        return crash_report
 
-    return parser(metadata, crash_report_file.read(), crash_report_file.name)
+    if metadata_filter is not None and not metadata_filter(metadata):
+        return None
+
+    return parser(metadata, crash_report_file.read(), filename, projection, tolerant)
 
 
 def get_crash_report_from_buf(
-    crash_report_buf: str, filename: str = None
+    crash_report_buf: str,
+    filename: str = None,
+    projection: Optional[Collection[str]] = None,
+    tolerant: bool = False,
 ) -> CrashReportBase:
     file = StringIO(crash_report_buf)
     file.name = filename
-    return get_crash_report_from_file(file)
+    return get_crash_report_from_file(file, projection, tolerant)
+
+
+def get_crash_report_from_path(
+    path: Union[str, Path],
+    projection: Optional[Collection[str]] = None,
+    tolerant: bool = False,
+) -> CrashReportBase:
+    with open(path, "rb") as crash_report_file:
+        return get_crash_report_from_file(crash_report_file, projection, tolerant)
+
+
+def get_crash_report_metadata_from_path(path: Union[str, Path]) -> Dict:
+    # the first line only: compressed reports are inflated no further than its block
+    with open(path, "rb") as crash_report_file:
+        with open_text(crash_report_file) as text_file:
+            return json.loads(text_file.readline())
+
+
+def get_crash_reports_from_directory(
+    directory: Union[str, Path],
+    pattern: Union[str, Sequence[str]] = REPORT_PATTERNS,
+    projection: Optional[Collection[str]] = None,
+    tolerant: bool = False,
+) -> Iterator[CrashReportBase]:
+    patterns = (pattern,) if isinstance(pattern, str) else pattern
+    paths = {path for pattern in patterns for path in Path(directory).glob(pattern)}
+    for path in sorted(paths):
+        if path.is_file():
+            yield get_crash_report_from_path(path, projection, tolerant)
+
+
+def _map_in_order(
+    function: Callable, items: Iterable, max_workers: Optional[int]
+) -> Iterator:
+    # `function` over `items` on a thread pool, yielded in the order of `items`. Only
+    # a bounded window is in flight, so `items` may be an endless stream
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending = deque()
+        for item in items:
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(function, item))
+        while pending:
+            yield pending.popleft().result()
+
+
+def get_crash_reports_from_paths(
+    paths: Iterable[Union[str, Path]],
+    projection: Optional[Collection[str]] = None,
+    tolerant: bool = False,
+    max_workers: Optional[int] = None,
+) -> Iterator[CrashReportBase]:
+    # parses on a thread pool and yields in the order of `paths`. Scales with cores on
+    # free-threaded builds; elsewhere it overlaps reads and decompression
+    yield from _map_in_order(
+        lambda path: get_crash_report_from_path(path, projection, tolerant),
+        paths,
+        max_workers,
+    )
+
+
+def get_crash_report_metadata_from_paths(
+    paths: Iterable[Union[str, Path]],
+    tolerant: bool = False,
+    max_workers: Optional[int] = None,
+) -> Iterator[Optional[Dict]]:
+    # the metadata lines of `paths`, in order, read on a thread pool: mostly waiting
+    # on the file system, which threads overlap even with the GIL. In tolerant mode
+    # None stands for an unreadable or malformed metadata line
+    def read(path):
+        try:
+            metadata = get_crash_report_metadata_from_path(path)
+        except (OSError, ValueError):
+            if not tolerant:
+                raise
+            return None
+        if not isinstance(metadata, dict):
+            if not tolerant:
+                raise MalformedReportError(f"metadata is not an object: {path}")
+            return None
+        return metadata
+
+    def read_chunk(chunk):
+        return [read(path) for path in chunk]
+
+    # a metadata line is too little work for a task of its own: paths are read in
+    # chunks, in order
+    paths = iter(paths)
+    chunks = iter(lambda: list(itertools.islice(paths, METADATA_CHUNK_SIZE)), [])
+    for chunk in _map_in_order(read_chunk, chunks, max_workers):
+        yield from chunk
+
+
+def summarize_errors(crash_reports: Iterable[CrashReportBase]) -> Counter:
+    # failure classes across a corpus of tolerant reports: the number of reports
+    # per (field, exception type)
+    result = Counter()
+    for crash_report in crash_reports:
+        result.update(
+            {
+                (error.field, type(error.error).__name__)
+                for error in crash_report.parse_all()
+            }
+        )
+    return result
@@ -0,0 +1,383 @@
+import csv
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pycrashreport.crash_report import (
+    CrashReportBase,
+    KernelModeCrashReport,
+    UserModeCrashReport,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+    pq = None
+
+
+class ExportFormat(Enum):
+    PARQUET = "parquet"
+    ARROW = "arrow"
+    CSV = "csv"
+
+
+# rows buffered per table before they are written out as one row group
+DEFAULT_BATCH_SIZE = 65536
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# one file per table, with the same columns whatever the reports hold. Every table
+# has the report's number in the export as `report`, the key to join them on
+SCHEMAS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "metadata": (
+        ("report", "int64"),
+        ("filename", "string"),
+        ("incident_id", "string"),
+        ("bug_type", "string"),
+        ("name", "string"),
+        ("timestamp", "timestamp"),
+        ("os_version", "string"),
+        ("bundle_id", "string"),
+        ("app_version", "string"),
+    ),
+    "exception": (
+        ("report", "int64"),
+        ("exception_type", "string"),
+        ("exception_subtype", "string"),
+        ("faulting_thread", "int64"),
+        ("application_specific_information", "string"),
+    ),
+    "frames": (
+        ("report", "int64"),
+        ("frame", "int64"),
+        ("image_name", "string"),
+        ("image_base", "uint64"),
+        ("image_offset", "uint64"),
+        ("symbol", "string"),
+        ("symbol_offset", "uint64"),
+    ),
+    "registers": (
+        ("report", "int64"),
+        ("name", "string"),
+        ("value", "uint64"),
+    ),
+    "panic": (
+        ("report", "int64"),
+        ("panic_string", "string"),
+        ("panic_caller", "uint64"),
+        ("debugger_message", "string"),
+        ("memory_id", "uint64"),
+        ("os_release_type", "string"),
+        ("os_version", "string"),
+        ("kernel_version", "string"),
+        ("kernel_uuid", "string"),
+        ("boot_session_uuid", "string"),
+        ("iboot_version", "string"),
+        ("secure_boot", "bool"),
+        ("roots_installed", "int64"),
+        ("paniclog_version", "int64"),
+        ("panicked_task_name", "string"),
+        ("panicked_task_pid", "int64"),
+        ("panicked_thread_tid", "uint64"),
+        ("last_started_kext", "string"),
+    ),
+    "kexts": (
+        ("report", "int64"),
+        ("name", "string"),
+        ("version", "string"),
+        ("uuid", "string"),
+        ("start", "uint64"),
+        ("end", "uint64"),
+        ("in_backtrace", "bool"),
+    ),
+}
+
+
+def _timestamp(crash_report: CrashReportBase) -> Optional[int]:
+    # a malformed timestamp is null in its own row, not fatal to the export
+    if not crash_report.metadata.get("timestamp"):
+        return None
+    try:
+        return crash_report.epoch_microseconds
+    except (TypeError, ValueError):
+        return None
+
+
+def _metadata_rows(report: int, crash_report: CrashReportBase) -> Iterator[Tuple]:
+    metadata = crash_report.metadata
+    yield (
+        report,
+        crash_report.filename,
+        crash_report.incident_id,
+        crash_report.bug_type_str,
+        crash_report.name,
+        _timestamp(crash_report),
+        metadata.get("os_version"),
+        metadata.get("bundleID"),
+        metadata.get("app_version"),
+    )
+
+
+def _exception_rows(report: int, crash_report: CrashReportBase) -> Iterator[Tuple]:
+    if isinstance(crash_report, UserModeCrashReport):
+        yield (
+            report,
+            crash_report.exception_type,
+            crash_report.exception_subtype,
+            crash_report.faulting_thread,
+            crash_report.application_specific_information,
+        )
+
+
+def _frame_rows(report: int, crash_report: CrashReportBase) -> Iterator[Tuple]:
+    if isinstance(crash_report, UserModeCrashReport):
+        for index, frame in enumerate(crash_report.frames):
+            yield (
+                report,
+                index,
+                frame.image_name,
+                frame.image_base,
+                frame.image_offset,
+                frame.symbol,
+                frame.symbol_offset,
+            )
+
+
+def _register_rows(report: int, crash_report: CrashReportBase) -> Iterator[Tuple]:
+    if isinstance(crash_report, UserModeCrashReport):
+        for register in crash_report.registers:
+            yield report, register.name, register.value
+
+
+def _panic_rows(report: int, crash_report: CrashReportBase) -> Iterator[Tuple]:
+    if isinstance(crash_report, KernelModeCrashReport):
+        task = crash_report.panicked_task
+        thread = crash_report.panicked_thread
+        yield (
+            report,
+            crash_report.panic_string,
+            crash_report.panic_caller,
+            crash_report.debugger_message,
+            crash_report.memory_id,
+            crash_report.os_release_type,
+            crash_report.os_version,
+            crash_report.kernel_version,
+            crash_report.kernel_uuid,
+            crash_report.boot_session_uuid,
+            crash_report.iboot_version,
+            crash_report.secure_boot,
+            crash_report.roots_installed,
+            crash_report.paniclog_version,
+            task.name if task is not None else None,
+            task.pid if task is not None else None,
+            thread.tid if thread is not None else None,
+            crash_report.last_started_kext,
+        )
+
+
+def _kext_rows(report: int, crash_report: CrashReportBase) -> Iterator[Tuple]:
+    if isinstance(crash_report, KernelModeCrashReport):
+        for in_backtrace, extensions in (
+            (False, crash_report.loaded_kernel_extensions),
+            (True, crash_report.kernel_extensions_in_backtrace),
+        ):
+            for extension in extensions:
+                yield (
+                    report,
+                    extension.name,
+                    extension.version,
+                    extension.uuid,
+                    extension.start,
+                    extension.end,
+                    in_backtrace,
+                )
+
+
+ROWS: Dict[str, Callable[[int, CrashReportBase], Iterator[Tuple]]] = {
+    "metadata": _metadata_rows,
+    "exception": _exception_rows,
+    "frames": _frame_rows,
+    "registers": _register_rows,
+    "panic": _panic_rows,
+    "kexts": _kext_rows,
+}
+
+
+def arrow_schema(table: str):
+    types = {
+        "int64": pa.int64(),
+        "uint64": pa.uint64(),
+        "string": pa.string(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in SCHEMAS[table]])
+
+
+def _record_batch(schema, rows: List[Tuple]):
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(column, type=field.type)
+            for column, field in zip(zip(*rows), schema)
+        ],
+        schema=schema,
+    )
+
+
+class _ParquetWriter:
+    def __init__(self, path: Path, table: str):
+        self._schema = arrow_schema(table)
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows: List[Tuple]) -> None:
+        batch = _record_batch(self._schema, rows)
+        self._writer.write_table(pa.Table.from_batches([batch]))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _ArrowWriter(_ParquetWriter):
+    def __init__(self, path: Path, table: str):
+        self._schema = arrow_schema(table)
+        self._writer = pa.ipc.new_file(
+            str(path),
+            self._schema,
+            # buffers are compressed one by one, columns are still read separately
+            options=pa.ipc.IpcWriteOptions(compression="zstd"),
+        )
+
+    def write(self, rows: List[Tuple]) -> None:
+        self._writer.write_batch(_record_batch(self._schema, rows))
+
+
+class _CsvWriter:
+    def __init__(self, path: Path, table: str):
+        columns = SCHEMAS[table]
+        self._timestamps = [
+            index for index, (_, kind) in enumerate(columns) if kind == "timestamp"
+        ]
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(name for name, _ in columns)
+
+    def write(self, rows: List[Tuple]) -> None:
+        if self._timestamps:
+            rows = [self._format_timestamps(row) for row in rows]
+        self._writer.writerows(rows)
+
+    def _format_timestamps(self, row: Tuple) -> List:
+        row = list(row)
+        for index in self._timestamps:
+            if row[index] is not None:
+                row[index] = (EPOCH + timedelta(microseconds=row[index])).isoformat()
+        return row
+
+    def close(self) -> None:
+        self._file.close()
+
+
+WRITERS = {
+    ExportFormat.PARQUET: _ParquetWriter,
+    ExportFormat.ARROW: _ArrowWriter,
+    ExportFormat.CSV: _CsvWriter,
+}
+
+
+class Exporter:
+    # streams reports into one file per table, `<table>.<format>` in `directory`.
+    # Rows are buffered per table and written out `batch_size` at a time, each batch a
+    # row group. Tables are written in parallel on a thread pool (pyarrow encodes and
+    # compresses without the GIL), with at most one batch in flight per table, so
+    # memory stays bounded by about two batches per table whatever the export size
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        output_format: ExportFormat = ExportFormat.PARQUET,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: Optional[int] = None,
+        tables: Iterable[str] = tuple(SCHEMAS),
+    ):
+        if output_format is not ExportFormat.CSV and pa is None:
+            raise ValueError(f"pyarrow is required for {output_format.value} export")
+        self.directory = Path(directory)
+        self.output_format = output_format
+        self.batch_size = batch_size
+        self.tables = list(tables)
+        unknown = set(self.tables) - SCHEMAS.keys()
+        if unknown:
+            raise ValueError(f"unknown tables: {', '.join(sorted(unknown))}")
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        writer_class = WRITERS[output_format]
+        self._writers = {
+            table: writer_class(
+                self.directory / f"{table}.{output_format.value}", table
+            )
+            for table in self.tables
+        }
+        self._rows: Dict[str, List[Tuple]] = {table: [] for table in self.tables}
+        self._pending: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers or min(len(self.tables), os.cpu_count() or 1) or 1
+        )
+        self.report_count = 0
+        self.row_counts: Dict[str, int] = {table: 0 for table in self.tables}
+
+    def add(self, crash_report: CrashReportBase) -> int:
+        # the report's number in the export, its `report` column
+        report = self.report_count
+        self.report_count += 1
+        for table in self.tables:
+            rows = self._rows[table]
+            rows.extend(ROWS[table](report, crash_report))
+            if len(rows) >= self.batch_size:
+                self._flush(table)
+        return report
+
+    def _flush(self, table: str) -> None:
+        rows = self._rows[table]
+        self._rows[table] = []
+        self.row_counts[table] += len(rows)
+        previous = self._pending.get(table)
+        if previous is not None:
+            # batches of a table are written in order, one at a time
+            previous.result()
+        self._pending[table] = self._executor.submit(self._writers[table].write, rows)
+
+    def close(self) -> None:
+        try:
+            for table in self.tables:
+                if self._rows[table]:
+                    self._flush(table)
+            for future in self._pending.values():
+                future.result()
+        finally:
+            self._executor.shutdown()
+            for writer in self._writers.values():
+                writer.close()
+
+    def __enter__(self) -> "Exporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def export_crash_reports(
+    crash_reports: Iterable[CrashReportBase],
+    directory: Union[str, Path],
+    output_format: ExportFormat = ExportFormat.PARQUET,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: Optional[int] = None,
+) -> Dict[str, int]:
+    # the number of rows written per table
+    with Exporter(directory, output_format, batch_size, max_workers) as exporter:
+        for crash_report in crash_reports:
+            exporter.add(crash_report)
+    return exporter.row_counts
@@ -0,0 +1,333 @@
+import operator
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Union,
+)
+
+from pycrashreport.crash_report import (
+    BUG_TYPE_PARSERS,
+    CrashReportBase,
+    get_crash_report_from_file,
+)
+from pycrashreport.report_property import report_property
+from pycrashreport.timestamp import parse_timestamp, parse_timestamp_naive
+
+
+def _bug_type(metadata: Mapping) -> object:
+    # compared as a number, so that `bug_type < 300` doesn't compare digit by digit
+    bug_type = metadata.get("bug_type")
+    if isinstance(bug_type, str) and bug_type.isdigit():
+        return int(bug_type)
+    return bug_type
+
+
+# fields answered by the metadata line alone, so before the body is read
+METADATA_FIELDS: Dict[str, Callable[[Mapping], object]] = {
+    "bug_type": _bug_type,
+    "name": lambda metadata: metadata.get("name"),
+    "incident_id": lambda metadata: metadata.get("incident_id"),
+    "os_version": lambda metadata: metadata.get("os_version"),
+    "bundle_id": lambda metadata: metadata.get("bundleID"),
+    "app_version": lambda metadata: metadata.get("app_version"),
+    "timestamp": lambda metadata: (
+        parse_timestamp_naive(metadata["timestamp"])
+        if metadata.get("timestamp")
+        else None
+    ),
+    "aware_timestamp": lambda metadata: (
+        parse_timestamp(metadata["timestamp"]) if metadata.get("timestamp") else None
+    ),
+}
+
+
+def _body_fields() -> FrozenSet[str]:
+    names = set()
+    for parser in {CrashReportBase, *BUG_TYPE_PARSERS.values()}:
+        for cls in parser.__mro__:
+            names.update(
+                name
+                for name, value in vars(cls).items()
+                if isinstance(value, report_property) and not name.startswith("_")
+            )
+    return frozenset(names - METADATA_FIELDS.keys())
+
+
+# any public report property; reports without it compare as None
+BODY_FIELDS = _body_fields()
+
+TOKEN = re.compile(
+    r"\s*(?:(?P<string>\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*')"
+    r"|(?P<operator>==|!=|<=|>=|!~|<|>|~)"
+    r"|(?P<paren>[()])"
+    r"|(?P<word>[^\s()=!<>~\"']+))"
+)
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+KEYWORDS = ("and", "or", "not")
+
+# the value of a body field while only the metadata line is known
+UNKNOWN = object()
+
+
+class _FieldFailed(Exception):
+    # a field of a malformed report failed to parse: the report matches nothing
+    pass
+
+
+class Comparison:
+    def __init__(self, field: str, op: str, literal: str):
+        self.field = field
+        self.op = op
+        self.literal = literal
+        self.pattern = re.compile(literal) if op in ("~", "!~") else None
+        try:
+            self.number = float(literal)
+        except ValueError:
+            self.number = None
+        self.timestamp = None
+        if field in ("timestamp", "aware_timestamp") and self.pattern is None:
+            self.timestamp = datetime.fromisoformat(literal)
+            if field == "timestamp" and self.timestamp.tzinfo is not None:
+                # a literal with an offset is a point in time: compared with the
+                # report's own offset rather than its wall clock
+                self.field = "aware_timestamp"
+
+    def evaluate(self, lookup: Callable[[str], object]) -> Optional[bool]:
+        value = lookup(self.field)
+        if value is UNKNOWN:
+            return None
+        if self.pattern is not None:
+            found = value is not None and self.pattern.search(str(value)) is not None
+            return found if self.op == "~" else not found
+
+        if isinstance(value, datetime):
+            other = self.timestamp
+            if other is not None and (value.tzinfo is None) != (other.tzinfo is None):
+                # wall clock times, unless both sides have an offset
+                value = value.replace(tzinfo=None)
+                other = other.replace(tzinfo=None)
+        elif isinstance(value, bool):
+            other = self.literal.lower() in ("true", "yes", "1")
+        elif isinstance(value, (int, float)):
+            other = self.number
+        elif value is not None:
+            value = str(value)
+            other = self.literal
+        else:
+            other = None
+        if value is None or other is None:
+            # missing values only ever differ
+            return self.op == "!="
+        return OPERATORS[self.op](value, other)
+
+    def fields(self) -> FrozenSet[str]:
+        return frozenset((self.field,))
+
+
+class Not:
+    def __init__(self, operand):
+        self.operand = operand
+
+    def evaluate(self, lookup) -> Optional[bool]:
+        result = self.operand.evaluate(lookup)
+        return None if result is None else not result
+
+    def fields(self) -> FrozenSet[str]:
+        return self.operand.fields()
+
+
+class And:
+    def __init__(self, operands):
+        self.operands = operands
+
+    def evaluate(self, lookup) -> Optional[bool]:
+        # three-valued: False wins over unknown, which wins over True
+        result = True
+        for operand in self.operands:
+            value = operand.evaluate(lookup)
+            if value is False:
+                return False
+            if value is None:
+                result = None
+        return result
+
+    def fields(self) -> FrozenSet[str]:
+        return frozenset().union(*(operand.fields() for operand in self.operands))
+
+
+class Or(And):
+    def evaluate(self, lookup) -> Optional[bool]:
+        result = False
+        for operand in self.operands:
+            value = operand.evaluate(lookup)
+            if value is True:
+                return True
+            if value is None:
+                result = None
+        return result
+
+
+class _Parser:
+    # expr := and ("or" and)* ; and := not ("and" not)* ;
+    # not := "not" not | "(" expr ")" | FIELD OPERATOR VALUE
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = TOKEN.match(expression, position)
+            if match is None:
+                raise ValueError(f"invalid filter at {position}: {expression!r}")
+            self.tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+        self.index = 0
+
+    def _peek(self):
+        return (
+            self.tokens[self.index] if self.index < len(self.tokens) else (None, None)
+        )
+
+    def _next(self):
+        token = self._peek()
+        if token[0] is None:
+            raise ValueError(f"unexpected end of filter: {self.expression!r}")
+        self.index += 1
+        return token
+
+    def parse(self):
+        node = self._or()
+        if self.index != len(self.tokens):
+            raise ValueError(f"unexpected {self._peek()[1]!r} in {self.expression!r}")
+        return node
+
+    def _or(self):
+        operands = [self._and()]
+        while self._peek() == ("word", "or"):
+            self.index += 1
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else Or(operands)
+
+    def _and(self):
+        operands = [self._not()]
+        while self._peek() == ("word", "and"):
+            self.index += 1
+            operands.append(self._not())
+        return operands[0] if len(operands) == 1 else And(operands)
+
+    def _not(self):
+        kind, value = self._next()
+        if (kind, value) == ("word", "not"):
+            return Not(self._not())
+        if (kind, value) == ("paren", "("):
+            node = self._or()
+            if self._next() != ("paren", ")"):
+                raise ValueError(f"missing ')' in {self.expression!r}")
+            return node
+        if kind != "word" or value in KEYWORDS:
+            raise ValueError(f"expected a field, got {value!r}")
+        if value not in METADATA_FIELDS and value not in BODY_FIELDS:
+            raise ValueError(f"unknown field: {value}")
+
+        kind, op = self._next()
+        if kind != "operator":
+            raise ValueError(f"expected an operator after {value}, got {op!r}")
+        kind, literal = self._next()
+        if kind == "string":
+            # only quotes and backslashes are unescaped, regex escapes are kept
+            literal = re.sub(r"\\([\"'\\])", r"\1", literal[1:-1])
+        elif kind != "word":
+            raise ValueError(f"expected a value after {value} {op}, got {literal!r}")
+        return Comparison(value, op, literal)
+
+
+class Filter:
+    # a compiled filter expression, e.g.
+    #   bug_type == 210 and panic_string ~ "watchdog" and timestamp >= 2024-01-01
+    # Metadata fields are checked against the first line before the body is read.
+    # Body fields are report properties, resolved lazily and only when referenced
+    def __init__(self, expression: str):
+        self.expression = expression
+        self._root = _Parser(expression).parse()
+        fields = self._root.fields()
+        self.metadata_fields = fields & METADATA_FIELDS.keys()
+        self.body_fields = fields - self.metadata_fields
+
+    def __repr__(self) -> str:
+        return f"<Filter {self.expression!r}>"
+
+    def _evaluate(self, lookup: Callable[[str], object]) -> Optional[bool]:
+        def checked_lookup(field):
+            try:
+                return lookup(field)
+            except Exception as e:
+                raise _FieldFailed() from e
+
+        try:
+            return self._root.evaluate(checked_lookup)
+        except _FieldFailed:
+            return False
+
+    def match_metadata(self, metadata: Mapping) -> Optional[bool]:
+        # None: depends on the body
+        def lookup(field):
+            getter = METADATA_FIELDS.get(field)
+            return getter(metadata) if getter is not None else UNKNOWN
+
+        return self._evaluate(lookup)
+
+    def __call__(self, crash_report: CrashReportBase) -> bool:
+        metadata = crash_report.metadata
+
+        def lookup(field):
+            getter = METADATA_FIELDS.get(field)
+            if getter is not None:
+                return getter(metadata)
+            return getattr(crash_report, field, None)
+
+        return bool(self._evaluate(lookup))
+
+    def read(self, crash_report_file, tolerant: bool = False):
+        # the report in `crash_report_file` if it matches, else None. Rejected by the
+        # metadata line alone, a report's body is never read
+        crash_report = get_crash_report_from_file(
+            crash_report_file,
+            # only the fields the parser's own properties read are decoded
+            projection=(),
+            tolerant=tolerant,
+            metadata_filter=lambda metadata: self.match_metadata(metadata) is not False,
+        )
+        if crash_report is None:
+            return None
+        if self.body_fields and not self(crash_report):
+            return None
+        return crash_report
+
+
+def filter_crash_reports(
+    paths: Iterable[Union[str, Path]],
+    where: Union[str, Filter],
+    tolerant: bool = False,
+) -> Iterator[CrashReportBase]:
+    if not isinstance(where, Filter):
+        where = Filter(where)
+    for path in paths:
+        with open(path, "rb") as crash_report_file:
+            crash_report = where.read(crash_report_file, tolerant)
+        if crash_report is not None:
+            yield crash_report
@@ -0,0 +1,105 @@
+import sys
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pycrashreport.crash_report import Image, UserModeCrashReport, normalize_uuid
+
+# an image as shared by every report that loaded it: the load address is per process
+CatalogImage = namedtuple("CatalogImage", "name path uuid arch size")
+
+
+class ReportImages:
+    # a report's image list as catalog ids, in the report's own `imageIndex` order
+    __slots__ = ("catalog", "ids", "bases", "_order", "_sorted_bases")
+
+    def __init__(self, catalog: "ImageCatalog", ids: array, bases: array):
+        self.catalog = catalog
+        self.ids = ids
+        self.bases = bases
+        # positions sorted by load address, for bisecting
+        self._order = array("I", sorted(range(len(bases)), key=bases.__getitem__))
+        self._sorted_bases = array("Q", (bases[index] for index in self._order))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Image:
+        image = self.catalog[self.ids[index]]
+        return Image(
+            name=image.name,
+            path=image.path,
+            uuid=image.uuid,
+            arch=image.arch,
+            base=self.bases[index],
+            size=image.size,
+        )
+
+    def lookup(self, address: int) -> Optional[Tuple[int, int]]:
+        # (catalog id, offset into the image) of the image containing `address`
+        position = bisect_right(self._sorted_bases, address) - 1
+        if position < 0:
+            return None
+        index = self._order[position]
+        image_id = self.ids[index]
+        offset = address - self.bases[index]
+        size = self.catalog[image_id].size
+        if size is not None and offset >= size:
+            return None
+        return image_id, offset
+
+
+class ImageCatalog:
+    def __init__(self):
+        self._images: List[CatalogImage] = []
+        self._ids: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+        self._by_uuid: Dict[str, List[int]] = {}
+        self._by_path: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def __getitem__(self, image_id: int) -> CatalogImage:
+        return self._images[image_id]
+
+    def intern(self, image: Image) -> int:
+        key = (image.uuid, image.path)
+        image_id = self._ids.get(key)
+        if image_id is not None:
+            return image_id
+
+        image_id = len(self._images)
+        path = sys.intern(image.path) if image.path is not None else None
+        self._images.append(
+            CatalogImage(
+                name=image.name,
+                path=path,
+                uuid=image.uuid,
+                arch=image.arch,
+                size=image.size,
+            )
+        )
+        self._ids[key] = image_id
+        if image.uuid is not None:
+            self._by_uuid.setdefault(image.uuid, []).append(image_id)
+        if path is not None:
+            self._by_path.setdefault(path, []).append(image_id)
+        return image_id
+
+    def add_images(self, images: Iterable[Image]) -> ReportImages:
+        ids = array("I")
+        bases = array("Q")
+        for image in images:
+            ids.append(self.intern(image))
+            bases.append(image.base or 0)
+        return ReportImages(self, ids, bases)
+
+    def add(self, crash_report: UserModeCrashReport) -> ReportImages:
+        return self.add_images(crash_report.images)
+
+    def find_by_uuid(self, uuid: str) -> List[int]:
+        return list(self._by_uuid.get(normalize_uuid(uuid), ()))
+
+    def find_by_path(self, path: str) -> List[int]:
+        return list(self._by_path.get(path, ()))
@@ -0,0 +1,172 @@
+import json
+import re
+import sys
+from typing import Collection, Dict, List, Optional, Tuple
+
+# `key` decodes the whole value, `key[index_key]` decodes only the array entry selected
+# by the (integer) value of another top-level key, e.g. `threads[faultingThread]`
+FIELD_SPEC = re.compile(r"([^\[\]]+)(?:\[([^\[\]]+)])?$")
+
+# possessive quantifiers (3.11+) let the regex engine drop its backtracking state, so
+# skipping a value does not allocate in proportion to its size
+_POSSESSIVE = "+" if sys.version_info >= (3, 11) else ""
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_PATTERN = rf'"[^"\\]*{_POSSESSIVE}(?:\\.[^"\\]*{_POSSESSIVE})*{_POSSESSIVE}"'
+STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+STRUCTURAL = re.compile(r'["\[\]{}]')
+SCALAR = re.compile(r"[^,\]}\s]+")
+
+
+def _container_pattern(depth: int) -> str:
+    # skips a container nested up to `depth` levels entirely inside the regex engine.
+    # Bracket kinds are not paired up: skipped values are not validated, only measured
+    plain = rf'[^"\[\]{{}}]*{_POSSESSIVE}'
+    inner = ""
+    for _ in range(depth):
+        item = _STRING_PATTERN + (rf"|[\[{{]{inner}[\]}}]" if inner else "")
+        inner = rf"{plain}(?:(?:{item}){plain})*{_POSSESSIVE}"
+    return rf"[\[{{]{inner}[\]}}]"
+
+
+CONTAINER = re.compile(_container_pattern(32), re.DOTALL)
+
+_decoder = json.JSONDecoder()
+
+
+def _error(message: str, text: str, idx: int) -> json.JSONDecodeError:
+    return json.JSONDecodeError(message, text, idx)
+
+
+def _skip_whitespace(text: str, idx: int) -> int:
+    return WHITESPACE.match(text, idx).end()
+
+
+def _skip_value(text: str, idx: int) -> int:
+    # find the end of a value without building any python object for it
+    char = text[idx : idx + 1]
+    if char == '"':
+        match = STRING.match(text, idx)
+        if match is None:
+            raise _error("Unterminated string", text, idx)
+        return match.end()
+
+    if char not in ("{", "["):
+        match = SCALAR.match(text, idx)
+        if match is None:
+            raise _error("Expecting value", text, idx)
+        return match.end()
+
+    match = CONTAINER.match(text, idx)
+    if match is not None:
+        return match.end()
+
+    # deeper than CONTAINER handles, or malformed
+    depth = 0
+    while True:
+        match = STRUCTURAL.search(text, idx)
+        if match is None:
+            raise _error("Unterminated container", text, idx)
+        token = match.group()
+        if token == '"':
+            string = STRING.match(text, match.start())
+            if string is None:
+                raise _error("Unterminated string", text, match.start())
+            idx = string.end()
+            continue
+        idx = match.end()
+        depth += 1 if token in "{[" else -1
+        if depth == 0:
+            return idx
+
+
+def _decode_array_entries(text: str, idx: int, wanted: int) -> Tuple[List, int]:
+    # entries other than `wanted` are skipped and kept as None so indices still line up
+    if text[idx : idx + 1] != "[":
+        raise _error("Expecting '['", text, idx)
+    result = []
+    idx = _skip_whitespace(text, idx + 1)
+    if text[idx : idx + 1] == "]":
+        return result, idx + 1
+    while True:
+        if len(result) == wanted:
+            value, idx = _decoder.raw_decode(text, idx)
+            result.append(value)
+        else:
+            idx = _skip_value(text, idx)
+            result.append(None)
+        idx = _skip_whitespace(text, idx)
+        char = text[idx : idx + 1]
+        if char == "]":
+            return result, idx + 1
+        if char != ",":
+            raise _error("Expecting ',' delimiter", text, idx)
+        idx = _skip_whitespace(text, idx + 1)
+
+
+def parse_fields(fields: Collection[str]) -> Dict[str, Optional[str]]:
+    result = {}
+    for field in fields:
+        match = FIELD_SPEC.match(field)
+        if match is None:
+            raise ValueError(f"invalid field: {field!r}")
+        key, index_key = match.groups()
+        # asking for the whole value always wins over a single entry
+        if result.get(key, index_key) is not None:
+            result[key] = index_key
+        else:
+            result[key] = None
+    return result
+
+
+def loads_projected(text: str, fields: Collection[str]) -> Dict:
+    projection = parse_fields(fields)
+    result = {}
+    deferred = {}
+
+    idx = _skip_whitespace(text, 0)
+    if text[idx : idx + 1] != "{":
+        raise _error("Expecting '{'", text, idx)
+    idx = _skip_whitespace(text, idx + 1)
+    if text[idx : idx + 1] == "}":
+        idx += 1
+    else:
+        while True:
+            if text[idx : idx + 1] != '"':
+                raise _error("Expecting property name", text, idx)
+            key, idx = json.decoder.scanstring(text, idx + 1)
+            idx = _skip_whitespace(text, idx)
+            if text[idx : idx + 1] != ":":
+                raise _error("Expecting ':' delimiter", text, idx)
+            idx = _skip_whitespace(text, idx + 1)
+
+            if key not in projection:
+                idx = _skip_value(text, idx)
+            elif projection[key] is None:
+                result[key], idx = _decoder.raw_decode(text, idx)
+            elif projection[key] in result:
+                result[key], idx = _decode_array_entries(
+                    text, idx, result[projection[key]]
+                )
+            else:
+                # the selecting key comes later in the document
+                deferred[key] = idx
+                idx = _skip_value(text, idx)
+
+            idx = _skip_whitespace(text, idx)
+            char = text[idx : idx + 1]
+            if char == "}":
+                idx += 1
+                break
+            if char != ",":
+                raise _error("Expecting ',' delimiter", text, idx)
+            idx = _skip_whitespace(text, idx + 1)
+
+    if _skip_whitespace(text, idx) != len(text):
+        raise _error("Extra data", text, idx)
+
+    for key, value_idx in deferred.items():
+        wanted = result.get(projection[key])
+        if isinstance(wanted, int):
+            result[key] = _decode_array_entries(text, value_idx, wanted)[0]
+    return result
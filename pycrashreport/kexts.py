@@ -0,0 +1,132 @@
+from array import array
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pycrashreport.crash_report import KernelExtension, KernelModeCrashReport
+
+# a kext as shared by every panic that loaded it: the load address is per boot
+CatalogKext = namedtuple("CatalogKext", "name version uuid size")
+
+NO_ADDRESS = 0
+
+
+class PanicKexts:
+    # a panic's kexts as catalog ids: the loaded ones in the panic's own order, with
+    # their load address (NO_ADDRESS if unknown, and no array at all when none is
+    # known, as in most panics), and the ones in the backtrace
+    __slots__ = ("catalog", "panic", "loaded", "addresses", "backtrace")
+
+    def __init__(
+        self,
+        catalog: "KextCatalog",
+        panic: int,
+        loaded: array,
+        addresses: array,
+        backtrace: array,
+    ):
+        self.catalog = catalog
+        self.panic = panic
+        self.loaded = loaded
+        self.addresses = addresses
+        self.backtrace = backtrace
+
+    def __len__(self) -> int:
+        return len(self.loaded)
+
+    def __getitem__(self, index: int) -> KernelExtension:
+        kext = self.catalog[self.loaded[index]]
+        start = (self.addresses[index] or None) if self.addresses else None
+        end = start + kext.size - 1 if start is not None and kext.size else None
+        return KernelExtension(
+            name=kext.name, version=kext.version, uuid=kext.uuid, start=start, end=end
+        )
+
+    def __iter__(self) -> Iterator[KernelExtension]:
+        for index in range(len(self.loaded)):
+            yield self[index]
+
+    def __contains__(self, name: str) -> bool:
+        return any(self.catalog[kext_id].name == name for kext_id in self.loaded)
+
+
+class KextCatalog:
+    def __init__(self):
+        self._kexts: List[CatalogKext] = []
+        self._ids: Dict[Tuple[str, Optional[str], Optional[str]], int] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        # per kext id, the panics that loaded it, in increasing order
+        self._panics: List[array] = []
+        self._panic_count = 0
+
+    def __len__(self) -> int:
+        return len(self._kexts)
+
+    def __getitem__(self, kext_id: int) -> CatalogKext:
+        return self._kexts[kext_id]
+
+    @property
+    def panic_count(self) -> int:
+        return self._panic_count
+
+    def intern(self, extension: KernelExtension) -> int:
+        key = (extension.name, extension.version, extension.uuid)
+        kext_id = self._ids.get(key)
+        if kext_id is not None:
+            return kext_id
+
+        kext_id = len(self._kexts)
+        size = None
+        if extension.start is not None and extension.end is not None:
+            size = extension.end - extension.start + 1
+        self._kexts.append(
+            CatalogKext(
+                name=extension.name,
+                version=extension.version,
+                uuid=extension.uuid,
+                size=size,
+            )
+        )
+        self._ids[key] = kext_id
+        self._by_name.setdefault(extension.name, []).append(kext_id)
+        self._panics.append(array("I"))
+        return kext_id
+
+    def add(self, crash_report: KernelModeCrashReport) -> PanicKexts:
+        panic = self._panic_count
+        self._panic_count += 1
+
+        loaded = array("I")
+        addresses = array("Q")
+        for extension in crash_report.loaded_kernel_extensions:
+            kext_id = self.intern(extension)
+            loaded.append(kext_id)
+            addresses.append(extension.start or NO_ADDRESS)
+            panics = self._panics[kext_id]
+            if not panics or panics[-1] != panic:
+                panics.append(panic)
+
+        if not any(addresses):
+            addresses = array("Q")
+
+        backtrace = array(
+            "I",
+            (
+                self.intern(extension)
+                for extension in crash_report.kernel_extensions_in_backtrace
+            ),
+        )
+        return PanicKexts(self, panic, loaded, addresses, backtrace)
+
+    def find_by_name(self, name: str) -> List[int]:
+        return list(self._by_name.get(name, ()))
+
+    def panics_with(self, name: str, version: Optional[str] = None) -> List[int]:
+        # the panics (numbered in the order they were added) that had the kext loaded
+        posting_lists = [
+            self._panics[kext_id]
+            for kext_id in self._by_name.get(name, ())
+            if version is None or self._kexts[kext_id].version == version
+        ]
+        if len(posting_lists) == 1:
+            return list(posting_lists[0])
+        return sorted(set().union(*posting_lists))
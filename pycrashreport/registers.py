@@ -0,0 +1,156 @@
+from array import array
+from collections import namedtuple
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+Register = namedtuple("Register", "name value")
+
+ARM64_REGISTERS = (
+    *(f"x{i}" for i in range(29)),
+    "fp",
+    "lr",
+    "sp",
+    "pc",
+    "cpsr",
+    "far",
+    "esr",
+)
+X86_64_REGISTERS = (
+    "rax",
+    "rbx",
+    "rcx",
+    "rdx",
+    "rdi",
+    "rsi",
+    "rbp",
+    "rsp",
+    *(f"r{i}" for i in range(8, 16)),
+    "rip",
+    "rflags",
+    "cs",
+    "fs",
+    "gs",
+    "cr2",
+    "trap",
+    "err",
+    "cpu",
+)
+ARCHITECTURES: Dict[str, Tuple[str, ...]] = {
+    "arm64": ARM64_REGISTERS,
+    "x86_64": X86_64_REGISTERS,
+}
+_INDEXES = {
+    architecture: {name: i for i, name in enumerate(layout)}
+    for architecture, layout in ARCHITECTURES.items()
+}
+
+RegisterVectors = namedtuple("RegisterVectors", "values present")
+
+
+def detect_architecture(names: Iterable[str]) -> Optional[str]:
+    for name in names:
+        if name == "x0" or name == "pc":
+            return "arm64"
+        if name == "rip" or name == "rax":
+            return "x86_64"
+    return None
+
+
+class RegisterFile:
+    # one fixed-size array slot per architectural register, plus a presence bitmask
+    __slots__ = ("architecture", "values", "present", "extra")
+
+    def __init__(
+        self,
+        architecture: Optional[str],
+        values: array,
+        present: int = 0,
+        extra: Optional[Dict[str, int]] = None,
+    ):
+        self.architecture = architecture
+        self.values = values
+        self.present = present
+        # registers outside of the architecture's layout, kept so nothing is lost
+        self.extra = extra or {}
+
+    @classmethod
+    def from_registers(
+        cls, registers: Sequence[Register], architecture: Optional[str] = None
+    ) -> "RegisterFile":
+        if architecture is None:
+            # no registers, or none of a known architecture: every register is kept
+            # in `extra` and the layout is empty
+            architecture = detect_architecture(register.name for register in registers)
+        elif architecture not in ARCHITECTURES:
+            raise ValueError(f"unsupported architecture: {architecture}")
+
+        indexes = _INDEXES.get(architecture, {})
+        values = array("Q", bytes(8 * len(indexes)))
+        present = 0
+        extra = {}
+        for name, value in registers:
+            index = indexes.get(name)
+            if index is None:
+                extra[name] = value
+            else:
+                values[index] = value
+                present |= 1 << index
+        return cls(architecture, values, present, extra)
+
+    @property
+    def layout(self) -> Tuple[str, ...]:
+        return ARCHITECTURES.get(self.architecture, ())
+
+    def index(self, name: str) -> int:
+        return _INDEXES.get(self.architecture, {})[name]
+
+    def get(self, key: Union[str, int], default: Optional[int] = None) -> Optional[int]:
+        if isinstance(key, str):
+            index = _INDEXES.get(self.architecture, {}).get(key)
+            if index is None:
+                return self.extra.get(key, default)
+        else:
+            index = key
+            if not 0 <= index < len(self.values):
+                raise IndexError(f"register index out of range: {index}")
+        if not self.present >> index & 1:
+            return default
+        return self.values[index]
+
+    def __getitem__(self, key: Union[str, int]) -> int:
+        value = self.get(key)
+        if value is None:
+            # sequence-style for slots of the layout, mapping-style for names
+            if isinstance(key, int):
+                raise IndexError(f"register {key} is not present")
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __iter__(self) -> Iterator[Register]:
+        for index, name in enumerate(self.layout):
+            if self.present >> index & 1:
+                yield Register(name=name, value=self.values[index])
+        for name, value in self.extra.items():
+            yield Register(name=name, value=value)
+
+    def __len__(self) -> int:
+        return bin(self.present).count("1") + len(self.extra)
+
+
+def extract_registers(
+    crash_reports: Iterable[Any],
+    names: Sequence[str] = ("pc", "lr", "far"),
+) -> Dict[str, RegisterVectors]:
+    # one value vector per register name, with a presence flag per report; takes
+    # anything with a `register_file`, i.e. UserModeCrashReport
+    result = {name: RegisterVectors(array("Q"), array("B")) for name in names}
+    for crash_report in crash_reports:
+        register_file = crash_report.register_file
+        for name in names:
+            value = register_file.get(name)
+            vectors = result[name]
+            vectors.values.append(value or 0)
+            vectors.present.append(value is not None)
+    return result
@@ -0,0 +1,63 @@
+from enum import Enum
+from typing import IO, Dict, Optional, Tuple
+
+import typer
+
+
+class OutputFormat(Enum):
+    PLAIN = "plain"
+    ANSI = "ansi"
+    COMPACT = "compact"
+
+
+_STYLES: Dict[Tuple[Optional[str], bool], Tuple[str, str]] = {}
+
+
+def _ansi_codes(fg: Optional[str], bold: bool) -> Tuple[str, str]:
+    # resolve each style to its escape sequences once instead of once per segment
+    codes = _STYLES.get((fg, bold))
+    if codes is None:
+        prefix, suffix = typer.style("\0", fg=fg, bold=bold or None).split("\0")
+        codes = (prefix, suffix)
+        _STYLES[(fg, bold)] = codes
+    return codes
+
+
+class Renderer:
+    # writes reports piece by piece into `stream`, never building the whole text
+    def __init__(
+        self, stream: IO[str], output_format: OutputFormat = OutputFormat.ANSI
+    ):
+        self.stream = stream
+        self.output_format = output_format
+
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+
+    def style(self, text: str, fg: Optional[str] = None, bold: bool = False) -> None:
+        if self.output_format is OutputFormat.ANSI:
+            prefix, suffix = _ansi_codes(fg, bold)
+            self.stream.write(prefix)
+            self.stream.write(text)
+            self.stream.write(suffix)
+        else:
+            self.stream.write(text)
+
+    def render(self, crash_report) -> None:
+        if self.output_format is OutputFormat.COMPACT:
+            fields = [
+                str(crash_report.incident_id),
+                str(crash_report.timestamp),
+                crash_report.bug_type_str,
+                str(crash_report.name),
+                crash_report._compact_summary(),
+            ]
+            # one report per line, whatever the fields contain
+            self.stream.write(
+                "\t".join(
+                    field.replace("\n", " ").replace("\t", " ") for field in fields
+                )
+            )
+            self.stream.write("\n")
+        else:
+            crash_report._render(self)
@@ -0,0 +1,61 @@
+from collections import namedtuple
+from typing import Any, Callable, Optional
+
+# a property (or "metadata"/"body" for the stages before them) that failed to parse
+FieldError = namedtuple("FieldError", "field error")
+
+
+class MalformedReportError(ValueError):
+    pass
+
+
+class report_property:
+    # a thread-safe `cached_property` that, on reports parsed with `tolerant=True`,
+    # records the failure in `report.errors` and caches `default()` (or None) instead
+    # of raising
+    def __init__(
+        self,
+        func: Optional[Callable] = None,
+        *,
+        default: Optional[Callable[[], Any]] = None,
+    ):
+        self.func = func
+        self.default = default
+        self.attrname = None
+        if func is not None:
+            self.__doc__ = func.__doc__
+
+    def __call__(self, func: Callable) -> "report_property":
+        # `@report_property(default=list)`
+        self.func = func
+        self.__doc__ = func.__doc__
+        return self
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.attrname = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance.__dict__
+        try:
+            return cache[self.attrname]
+        except KeyError:
+            pass
+
+        # threads sharing a report compute each property once: the others wait for it.
+        # Reentrant, as properties are built from other properties
+        with instance._lock:
+            try:
+                return cache[self.attrname]
+            except KeyError:
+                pass
+            try:
+                value = self.func(instance)
+            except Exception as e:
+                if not instance.tolerant:
+                    raise
+                instance.errors.append(FieldError(self.attrname, e))
+                value = self.default() if self.default is not None else None
+            cache[self.attrname] = value
+            return value
@@ -0,0 +1,256 @@
+import itertools
+import math
+import random
+from collections import Counter, namedtuple
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import NormalDist
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pycrashreport.crash_report import (
+    CrashReportBase,
+    get_crash_report_metadata_from_paths,
+    get_crash_reports_from_paths,
+)
+from pycrashreport.filters import Filter
+
+# reports are stratified by what their metadata line tells: bug type and process
+StratumKey = Tuple[Optional[str], Optional[str]]
+
+DEFAULT_PER_STRATUM = 32
+
+# the parsed sample of a stratum, and the exact number of reports in it
+Stratum = namedtuple("Stratum", "population crash_reports")
+
+
+def stratum_of(metadata: Mapping) -> StratumKey:
+    return metadata.get("bug_type"), metadata.get("name")
+
+
+class Reservoir:
+    # a uniform sample of `size` among every path added so far (algorithm R)
+    __slots__ = ("size", "population", "paths")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.population = 0
+        self.paths: List[Union[str, Path]] = []
+
+    def add(self, path: Union[str, Path], generator: random.Random) -> None:
+        self.population += 1
+        if len(self.paths) < self.size:
+            self.paths.append(path)
+            return
+        index = generator.randrange(self.population)
+        if index < self.size:
+            self.paths[index] = path
+
+
+@dataclass(frozen=True)
+class Estimate:
+    count: float
+    # half width of the confidence interval around `count`
+    error: float
+    confidence: float
+
+    @property
+    def low(self) -> float:
+        return max(0.0, self.count - self.error)
+
+    @property
+    def high(self) -> float:
+        return self.count + self.error
+
+    def __str__(self) -> str:
+        return f"{self.count:.0f} ± {self.error:.0f} ({self.confidence:.0%})"
+
+
+class SampleSummary:
+    def __init__(
+        self,
+        strata: Dict[StratumKey, Stratum],
+        confidence: float = 0.95,
+        where: Optional[Filter] = None,
+    ):
+        self.strata = strata
+        self.confidence = confidence
+        # reports of the sample that `where` rejects count as matching nothing
+        self.where = where
+        self._z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    @property
+    def population(self) -> int:
+        return sum(population for population, _ in self.strata.values())
+
+    @property
+    def sampled(self) -> int:
+        return sum(len(crash_reports) for _, crash_reports in self.strata.values())
+
+    def stratum_counts(self) -> Counter:
+        # exact: every metadata line was read
+        return Counter(
+            {key: population for key, (population, _) in self.strata.items()}
+        )
+
+    def _matching(self, crash_reports: List[CrashReportBase]) -> List[CrashReportBase]:
+        if self.where is None or not self.where.body_fields:
+            return crash_reports
+        return [
+            crash_report for crash_report in crash_reports if self.where(crash_report)
+        ]
+
+    def _estimate(self, matches: Mapping[StratumKey, int]) -> Estimate:
+        # stratified estimate of a total, with a normal-approximation interval and the
+        # finite population correction: fully sampled strata add no error
+        count = 0.0
+        variance = 0.0
+        for key, (population, crash_reports) in self.strata.items():
+            sampled = len(crash_reports)
+            if not sampled:
+                continue
+            matched = matches.get(key, 0)
+            count += population * matched / sampled
+            # smoothed, so that strata sampled as all or nothing keep their uncertainty
+            proportion = (matched + 1) / (sampled + 2)
+            variance += (
+                population**2
+                * (1 - sampled / population)
+                * proportion
+                * (1 - proportion)
+                / sampled
+            )
+        return Estimate(count, self._z * math.sqrt(variance), self.confidence)
+
+    def estimate(
+        self, predicate: Union[str, Filter, Callable[[CrashReportBase], bool]]
+    ) -> Estimate:
+        # how many reports of the whole population match `predicate`, a filter
+        # expression such as "exception_type ~ BAD_ACCESS" or a callable
+        if isinstance(predicate, str):
+            predicate = Filter(predicate)
+        return self._estimate(
+            {
+                key: sum(
+                    1
+                    for crash_report in self._matching(crash_reports)
+                    if predicate(crash_report)
+                )
+                for key, (_, crash_reports) in self.strata.items()
+            }
+        )
+
+    def estimate_counts(
+        self, key: Callable[[CrashReportBase], Hashable]
+    ) -> Dict[Hashable, Estimate]:
+        # how many reports of the whole population have each value of `key` that
+        # the sample holds
+        per_stratum = {
+            stratum: Counter(
+                key(crash_report) for crash_report in self._matching(crash_reports)
+            )
+            for stratum, (_, crash_reports) in self.strata.items()
+        }
+        values = set().union(*per_stratum.values())
+        return {
+            value: self._estimate(
+                {stratum: counts[value] for stratum, counts in per_stratum.items()}
+            )
+            for value in values
+        }
+
+
+class StratifiedSampler:
+    # stratifies reports by (bug_type, name) from their metadata line alone, keeping a
+    # reservoir of `per_stratum` paths in each stratum. Only the sampled reports are
+    # parsed in full: their counts are extrapolated to each stratum's exact size
+    def __init__(
+        self,
+        per_stratum: int = DEFAULT_PER_STRATUM,
+        seed: Optional[int] = None,
+        where: Union[str, Filter, None] = None,
+    ):
+        if per_stratum < 1:
+            raise ValueError("per_stratum must be at least 1")
+        self.per_stratum = per_stratum
+        self.where = Filter(where) if isinstance(where, str) else where
+        self.strata: Dict[StratumKey, Reservoir] = {}
+        self.unreadable = 0
+        self._generator = random.Random(seed)
+
+    @property
+    def population(self) -> int:
+        return sum(reservoir.population for reservoir in self.strata.values())
+
+    def add(self, path: Union[str, Path], metadata: Mapping) -> None:
+        # reports the filter rejects by their metadata alone are left out of the
+        # population. Its body predicates are applied to the parsed sample, see
+        # `SampleSummary`
+        if self.where is not None and self.where.match_metadata(metadata) is False:
+            return
+        key = stratum_of(metadata)
+        reservoir = self.strata.get(key)
+        if reservoir is None:
+            reservoir = self.strata[key] = Reservoir(self.per_stratum)
+        reservoir.add(path, self._generator)
+
+    def add_paths(
+        self,
+        paths: Iterable[Union[str, Path]],
+        tolerant: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        # only a window of paths is held while their metadata lines are read
+        paths, pending = itertools.tee(paths)
+        for path, metadata in zip(
+            paths, get_crash_report_metadata_from_paths(pending, tolerant, max_workers)
+        ):
+            if metadata is None:
+                # unreadable metadata lines are counted, not sampled
+                self.unreadable += 1
+            else:
+                self.add(path, metadata)
+
+    def parse(
+        self,
+        projection: Optional[Collection[str]] = None,
+        tolerant: bool = False,
+        max_workers: Optional[int] = None,
+        confidence: float = 0.95,
+    ) -> SampleSummary:
+        paths = [path for reservoir in self.strata.values() for path in reservoir.paths]
+        crash_reports = list(
+            get_crash_reports_from_paths(paths, projection, tolerant, max_workers)
+        )
+        strata = {}
+        start = 0
+        for key, reservoir in self.strata.items():
+            end = start + len(reservoir.paths)
+            strata[key] = Stratum(reservoir.population, crash_reports[start:end])
+            start = end
+        return SampleSummary(strata, confidence, self.where)
+
+
+def sample_crash_reports(
+    paths: Iterable[Union[str, Path]],
+    per_stratum: int = DEFAULT_PER_STRATUM,
+    seed: Optional[int] = None,
+    where: Union[str, Filter, None] = None,
+    projection: Optional[Collection[str]] = None,
+    tolerant: bool = False,
+    max_workers: Optional[int] = None,
+    confidence: float = 0.95,
+) -> SampleSummary:
+    sampler = StratifiedSampler(per_stratum, seed, where)
+    sampler.add_paths(paths, tolerant, max_workers)
+    return sampler.parse(projection, tolerant, max_workers, confidence)
@@ -0,0 +1,228 @@
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Callable, Dict, Optional
+
+from pycrashreport.crash_report import get_crash_report_from_file
+
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+LATENCY_WINDOW = 1024
+
+
+def parse_report(data: bytes) -> Dict:
+    # runs on the worker pool: module level so that process pools can pickle it
+    return get_crash_report_from_file(BytesIO(data), tolerant=True).to_dict()
+
+
+class Metrics:
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        # latencies of the most recent requests, for the percentiles
+        self._latencies = deque(maxlen=window)
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.too_large = 0
+        self.restarted = 0
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if ok:
+                self.completed += 1
+                self._latencies.append(latency)
+            else:
+                self.failed += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            uptime = time.monotonic() - self._started
+            latencies = sorted(self._latencies)
+            result = {
+                "uptime": uptime,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "too_large": self.too_large,
+                "restarted": self.restarted,
+                "reports_per_second": self.completed / uptime if uptime else 0.0,
+            }
+        for name, quantile in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+            result[f"latency_{name}"] = (
+                latencies[min(int(quantile * len(latencies)), len(latencies) - 1)]
+                if latencies
+                else None
+            )
+        return result
+
+
+class ReportHandler(BaseHTTPRequestHandler):
+    server: "ReportServer"
+
+    def _reply(self, status: int, body: Dict, headers: Optional[Dict] = None) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            self._reply(200, self.server.metrics.snapshot())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        server = self.server
+        if self.path != "/parse":
+            self._reply(404, {"error": "not found"})
+            return
+
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            self._reply(411, {"error": "Content-Length required"})
+            return
+        if int(length) > server.max_request_size:
+            # the body is never read: drop the connection instead of draining it
+            server.metrics.count("too_large")
+            self.close_connection = True
+            self._reply(413, {"error": f"larger than {server.max_request_size} bytes"})
+            return
+
+        # backpressure: a slot covers reading, queueing and parsing a report, and is
+        # only given back once the worker is done with it, even after a timeout
+        if not server.slots.acquire(blocking=False):
+            server.metrics.count("rejected")
+            self._reply(
+                503, {"error": "too many pending reports"}, {"Retry-After": "1"}
+            )
+            return
+
+        started = time.monotonic()
+        server.metrics.begin()
+        try:
+            data = self.rfile.read(int(length))
+        except BaseException:
+            server.slots.release()
+            server.metrics.end(time.monotonic() - started, ok=False)
+            raise
+
+        try:
+            try:
+                result = self._parse(data)
+            except BrokenExecutor:
+                # a worker died, maybe while parsing another report: retry once on
+                # the fresh pool, with a slot of its own
+                if not server.slots.acquire(timeout=server.parse_timeout):
+                    raise
+                result = self._parse(data)
+        except FutureTimeoutError:
+            server.metrics.end(time.monotonic() - started, ok=False)
+            self._reply(504, {"error": "timed out"})
+            return
+        except Exception as e:
+            server.metrics.end(time.monotonic() - started, ok=False)
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        server.metrics.end(time.monotonic() - started, ok=True)
+        self._reply(200, result)
+
+    def _parse(self, data: bytes) -> Dict:
+        # takes over a slot the caller acquired
+        server = self.server
+        executor = server.executor
+        try:
+            future = executor.submit(parse_report, data)
+        except BaseException as e:
+            server.slots.release()
+            if isinstance(e, BrokenExecutor):
+                server.replace_executor(executor)
+            raise
+        future.add_done_callback(lambda _: server.slots.release())
+        try:
+            return future.result(timeout=server.parse_timeout)
+        except BrokenExecutor:
+            server.replace_executor(executor)
+            raise
+
+    def log_message(self, format, *args) -> None:
+        # per-request logging costs more than parsing at high rates: see /metrics
+        pass
+
+
+class ReportServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        executor_factory: Callable[[], Executor] = ProcessPoolExecutor,
+        max_pending: int = 64,
+        max_request_size: int = MAX_REQUEST_SIZE,
+        parse_timeout: float = 30.0,
+    ):
+        super().__init__(address, ReportHandler)
+        # a process pool is unusable once one of its workers died, so the server
+        # builds its own and replaces it when that happens
+        self.executor_factory = executor_factory
+        self.executor = executor_factory()
+        self._executor_lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.max_request_size = max_request_size
+        self.parse_timeout = parse_timeout
+        self.metrics = Metrics()
+
+    def replace_executor(self, broken: Executor) -> None:
+        with self._executor_lock:
+            if self.executor is broken:
+                self.executor = self.executor_factory()
+                self.metrics.count("restarted")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    workers: Optional[int] = None,
+    threads: bool = False,
+    max_pending: int = 64,
+    max_request_size: int = MAX_REQUEST_SIZE,
+) -> None:
+    # processes by default: parsing is CPU bound. Threads suit free-threaded builds
+    executor_class = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    with ReportServer(
+        (host, port),
+        partial(executor_class, max_workers=workers),
+        max_pending=max_pending,
+        max_request_size=max_request_size,
+    ) as server:
+        server.serve_forever()
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Tuple
+
+# all crash reports use the same fixed layout: `YYYY-MM-DD HH:MM:SS[.ff] +HHMM`
+_TIMEZONES: Dict[int, timezone] = {}
+_MICROSECONDS_PER_DAY = 86400 * 1000000
+
+
+def _split(timestamp: str) -> Tuple[int, int, int, int, int, int, int, int]:
+    if (
+        len(timestamp) < 19
+        or timestamp[4] != "-"
+        or timestamp[7] != "-"
+        or timestamp[13] != ":"
+        or timestamp[16] != ":"
+    ):
+        raise ValueError(f"invalid timestamp: {timestamp!r}")
+
+    microsecond = 0
+    offset = 0
+    rest = timestamp[19:]
+    if rest.startswith("."):
+        fraction, _, rest = rest[1:].partition(" ")
+        microsecond = int((fraction + "000000")[:6])
+    else:
+        rest = rest.lstrip()
+    if rest:
+        sign = -1 if rest[0] == "-" else 1
+        offset = sign * (int(rest[1:3]) * 60 + int(rest[3:5]))
+
+    return (
+        int(timestamp[0:4]),
+        int(timestamp[5:7]),
+        int(timestamp[8:10]),
+        int(timestamp[11:13]),
+        int(timestamp[14:16]),
+        int(timestamp[17:19]),
+        microsecond,
+        offset,
+    )
+
+
+def _days_from_civil(year: int, month: int, day: int) -> int:
+    # Howard Hinnant's days_from_civil, avoiding any datetime object creation
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+# microseconds since the unix epoch, for sorting and bucketing without datetime objects
+def parse_timestamp_epoch(timestamp: str) -> int:
+    year, month, day, hour, minute, second, microsecond, offset = _split(timestamp)
+    seconds = hour * 3600 + (minute - offset) * 60 + second
+    return (
+        _days_from_civil(year, month, day) * _MICROSECONDS_PER_DAY
+        + seconds * 1000000
+        + microsecond
+    )
+
+
+# report-local wall clock time, without timezone information
+def parse_timestamp_naive(timestamp: str) -> datetime:
+    return datetime(*_split(timestamp)[:7])
+
+
+def parse_timestamp(timestamp: str) -> datetime:
+    *fields, offset = _split(timestamp)
+    tz = _TIMEZONES.get(offset)
+    if tz is None:
+        tz = timezone(timedelta(minutes=offset))
+        _TIMEZONES[offset] = tz
+    return datetime(*fields, tzinfo=tz)
@@ -0,0 +1,148 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from pycrashreport.compression import COMPRESSED_SUFFIXES
+from pycrashreport.crash_report import CrashReportBase, get_crash_report_from_path
+
+REPORT_SUFFIXES = (".ips", *(f".ips{suffix}" for suffix in COMPRESSED_SUFFIXES))
+
+
+class FileState(NamedTuple):
+    inode: int
+    mtime_ns: int
+    size: int
+
+    @classmethod
+    def from_stat(cls, stat: os.stat_result) -> "FileState":
+        return cls(stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class DirectoryWatcher:
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        cursor: Optional[Union[str, Path]] = None,
+        suffixes: Tuple[str, ...] = REPORT_SUFFIXES,
+        settle_time: float = 2.0,
+    ):
+        self.directory = Path(directory)
+        self.cursor = Path(cursor) if cursor is not None else None
+        self.suffixes = suffixes
+        # a file is considered completely written once it stopped changing between two
+        # polls, or once it has not been modified for `settle_time` seconds
+        self.settle_time = settle_time
+        self._resumed = False
+        self._seen: Dict[str, FileState] = {}
+        self._pending: Dict[str, FileState] = {}
+        self._directory_mtime_ns: Optional[int] = None
+        self._load()
+
+    def _load(self) -> None:
+        if self.cursor is None or not self.cursor.exists():
+            return
+        cursor = json.loads(self.cursor.read_text())
+        self._directory_mtime_ns = cursor["directory_mtime_ns"]
+        self._resumed = True
+        self._seen = {name: FileState(*state) for name, state in cursor["seen"].items()}
+        self._pending = {
+            name: FileState(*state) for name, state in cursor["pending"].items()
+        }
+
+    def save(self) -> None:
+        if self.cursor is None:
+            return
+        temporary = self.cursor.with_name(self.cursor.name + ".tmp")
+        temporary.write_text(
+            json.dumps(
+                {
+                    "directory_mtime_ns": self._directory_mtime_ns,
+                    "seen": self._seen,
+                    "pending": self._pending,
+                }
+            )
+        )
+        os.replace(temporary, self.cursor)
+
+    def _list_new_files(self) -> bool:
+        # entries are only created, renamed or removed when the directory's own mtime
+        # changes, so an unchanged directory costs a single stat(). Files rewritten in
+        # place don't change it: they are only noticed when resuming from the cursor
+        directory_mtime_ns = self.directory.stat().st_mtime_ns
+        if directory_mtime_ns == self._directory_mtime_ns and not self._resumed:
+            return False
+        self._directory_mtime_ns = directory_mtime_ns
+
+        names = set()
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                names.add(entry.name)
+                if entry.name in self._pending:
+                    continue
+                if not entry.name.endswith(self.suffixes) or not entry.is_file():
+                    continue
+                seen = self._seen.get(entry.name)
+                if seen is not None:
+                    if self._resumed:
+                        # anything may have changed while nobody was watching
+                        state = FileState.from_stat(os.stat(entry.path))
+                        if state == seen:
+                            continue
+                    elif entry.inode() == seen.inode:
+                        # replaced through a rename otherwise: the inode comes with
+                        # the directory listing, without a stat() per file
+                        continue
+                    del self._seen[entry.name]
+                # matches no actual state: the file is parsed right away if it has
+                # already settled, otherwise once it stops changing
+                self._pending[entry.name] = FileState(-1, -1, -1)
+
+        for name in self._seen.keys() - names:
+            del self._seen[name]
+        self._resumed = False
+        return True
+
+    def poll(self) -> List[CrashReportBase]:
+        changed = self._list_new_files() or bool(self._pending)
+
+        result = []
+        now_ns = time.time_ns()
+        for name, previous in list(self._pending.items()):
+            path = self.directory / name
+            try:
+                state = FileState.from_stat(path.stat())
+            except FileNotFoundError:
+                del self._pending[name]
+                continue
+
+            settled = now_ns - state.mtime_ns >= self.settle_time * 1e9
+            if state != previous and not settled:
+                self._pending[name] = state
+                continue
+
+            try:
+                crash_report = get_crash_report_from_path(path)
+            except Exception:
+                if settled:
+                    # not a crash report, don't retry it until it changes
+                    del self._pending[name]
+                    self._seen[name] = state
+                else:
+                    # not fully written yet, retried on a later poll
+                    self._pending[name] = state
+                continue
+
+            del self._pending[name]
+            self._seen[name] = state
+            result.append(crash_report)
+
+        if changed:
+            self.save()
+        return result
+
+    def watch(self, interval: float = 1.0) -> Iterator[CrashReportBase]:
+        while True:
+            yield from self.poll()
+            time.sleep(interval)
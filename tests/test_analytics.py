@@ -0,0 +1,98 @@
+import json
+from array import array
+from pathlib import Path
+
+import pytest
+
+from pycrashreport import analytics
+from pycrashreport.analytics import ReportTable
+from pycrashreport.crash_report import (
+    get_crash_report_from_buf,
+    get_crash_report_from_file,
+)
+
+FIXTURES = [
+    "user_mode_crash_report_ios14_non_symbolicated_abort.ips",
+    "user_mode_crash_report_ios14_symbolicated.ips",
+    "user_mode_crash_report_monterey_non_symbolicated.ips",
+    "kernel_mode_crash_report_ios16_forceReset-full.ips",
+    "user_mode_crash_report_ios14_non_symbolicated_abort.ips",
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def table(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(analytics, "np", None)
+    elif analytics.np is None:
+        pytest.skip("numpy is not installed")
+    reports = []
+    for filename in FIXTURES:
+        with open(Path(__file__).parent / filename, "rt") as f:
+            reports.append(get_crash_report_from_file(f))
+    return ReportTable.from_reports(reports)
+
+
+def test_top_crashers(table):
+    assert len(table) == 5
+    assert table.top_crashers(by=("exception_type",), n=1) == [
+        (("EXC_CRASH (SIGABRT)",), 3)
+    ]
+    assert table.count_by("exception_type") == {
+        ("EXC_CRASH (SIGABRT)",): 3,
+        ("EXC_BAD_ACCESS",): 1,
+        (None,): 1,
+    }
+    assert table.count_by("bug_type", "panic_string")[("151", "btn_rst")] == 1
+    assert table.count_by("top_image")[("libsystem_kernel.dylib",)] == 3
+
+
+def test_crash_rate(table):
+    rate = table.crash_rate(window=86400 * 365)
+    assert sum(count for _, count in rate) == 5
+    assert [start for start, _ in rate] == sorted(start for start, _ in rate)
+
+
+def test_image_offset_histogram(table):
+    histogram = table.image_offset_histogram("libdispatch.dylib", bin_size=0x10000)
+    assert histogram == [(0x0, 6), (0x10000, 4)]
+    assert table.image_offset_histogram("missing.dylib") == []
+
+
+def test_to_pandas(table):
+    pytest.importorskip("pandas")
+    frame = table.to_pandas()
+    assert frame["exception_type"].value_counts()["EXC_CRASH (SIGABRT)"] == 3
+    assert frame["timestamp"].notna().all()
+
+
+def test_to_arrow(table):
+    pytest.importorskip("pyarrow")
+    arrow_table = table.to_arrow()
+    assert arrow_table.num_rows == 5
+    assert arrow_table.column("panic_string").null_count == 4
+
+
+def test_count_by_many_categories():
+    # (2**21 + 1) ** 3 combinations don't fit in a single int64 key
+    size = 2**21
+    codes = array("q", [size - 1, 0, -1, size - 1])
+    columns = {
+        name: analytics.Column(analytics._to_vector(codes), range(size))
+        for name in ("a", "b", "c")
+    }
+    empty = analytics._to_vector(array("q"))
+    wide = ReportTable(columns, codes, empty, analytics.Column(empty, []), empty)
+    assert wide.count_by("a", "b", "c") == {
+        (size - 1, size - 1, size - 1): 2,
+        (0, 0, 0): 1,
+        (None, None, None): 1,
+    }
+
+
+@pytest.mark.parametrize("tolerant", [False, True])
+def test_malformed_timestamp(tolerant):
+    metadata = {"bug_type": "999", "name": "late", "timestamp": "yesterday"}
+    crash_report = get_crash_report_from_buf(json.dumps(metadata), tolerant=tolerant)
+    table = ReportTable.from_reports([crash_report])
+    assert list(table.timestamps) == [analytics.MISSING_TIMESTAMP]
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from pycrashreport.call_tree import CallTreeBuilder, aggregate_call_trees
+from pycrashreport.crash_report import BugType, get_crash_report_from_file
+
+SPIN_REPORT = Path(__file__).parent / "spin_report_macos_ventura.ips"
+
+
+def test_spin_report():
+    with open(SPIN_REPORT, "rt") as f:
+        crash_report = get_crash_report_from_file(f)
+    assert crash_report.bug_type == BugType.HangSpin
+    assert crash_report.command == "Finder"
+    assert crash_report.duration == 10.0
+    assert crash_report.steps == 1001
+
+    root = crash_report.call_tree
+    assert root.count == 2002
+    start = root.children["start + 2544 (dyld + 24764)"]
+    assert start.count == 1001
+    main = start.children["main + 80 (Finder + 5120)"]
+    assert [child.count for child in main.children.values()] == [600, 401]
+    assert [node.name for node in root.heaviest_path()][-1] == (
+        "psynch_cvcontinue + 0 (pthread + 20032)"
+    )
+
+
+def test_aggregate_call_trees():
+    with open(SPIN_REPORT, "rt") as first, open(SPIN_REPORT, "rt") as second:
+        root = aggregate_call_trees([first, second])
+    assert root.count == 4004
+    assert root.children[
+        "start_wqthread + 8 (libsystem_pthread.dylib + 7488)"
+    ].count == (2002)
+    assert len(root.children) == 2
+
+
+def test_feed_text_matches_feed_lines():
+    text = SPIN_REPORT.read_text()
+    for body in (text, text.rstrip("\n"), text.replace("\n\n", "\n\n\n")):
+        streamed = CallTreeBuilder().feed_text(body)
+        listed = CallTreeBuilder().feed_lines(body.split("\n"))
+        assert streamed == listed
+    assert streamed.count == 2002
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from pycrashreport.clustering import (
+    PanicClusterer,
+    cluster_panics,
+    normalize_panic_string,
+)
+from pycrashreport.crash_report import get_crash_report_from_buf
+
+PANIC = (
+    Path(__file__).parent / "kernel_mode_crash_report_ios16_forceReset-full.ips"
+).read_text()
+
+WATCHDOG = (
+    "userspace watchdog timeout: no successful checkins from {} in {} seconds "
+    "service returned not alive with context : is_alive_func returned unhealthy "
+    ": current {} stuck since {}"
+)
+
+
+@pytest.mark.parametrize(
+    ("panic_string", "normalized"),
+    [
+        (
+            "Kernel data abort. at pc 0xfffffff0174f3b28, lr 0x5d1e7ff0174f3ad8",
+            "Kernel data abort. at pc <addr>, lr <addr>",
+        ),
+        ("i2c3 timeout on cpu 5 after 1.5 s", "i2c<n> timeout on cpu <n> after <n> s"),
+        (
+            "SEP panic UUID 6AAC7152-26B3-355D-95F0-EC89EFA4152C ",
+            "SEP panic UUID <uuid>",
+        ),
+        ("AppleT8020PMGR: ARM64 btn_rst", "AppleT8020PMGR: ARM64 btn_rst"),
+    ],
+)
+def test_normalize(panic_string, normalized):
+    assert normalize_panic_string(panic_string) == normalized
+
+
+def test_exact_bucket():
+    clusterer = PanicClusterer()
+    first = clusterer.add("watchdog timeout: no checkins from watchdogd in 180 seconds")
+    second = clusterer.add("watchdog timeout: no checkins from watchdogd in 90 seconds")
+    assert first is second
+    assert (len(clusterer), first.size, first.variants) == (1, 2, 1)
+
+
+def test_near_duplicates():
+    clusterer = PanicClusterer()
+    for index, daemon in enumerate(("thermalmonitord", "backboardd", "wifid")):
+        for stuck in ("ping", "wait for reply"):
+            clusterer.add(WATCHDOG.format(f"com.apple.{daemon}", 120, index, stuck))
+    clusterer.add("btn_rst")
+    clusterer.add("zalloc: zone map exhausted while allocating from zone [kalloc.48]")
+
+    watchdog, button, zalloc = clusterer
+    assert len(clusterer) == 3
+    assert (watchdog.size, watchdog.variants) == (6, 6)
+    assert watchdog.representative.startswith("userspace watchdog timeout")
+    assert button.size == zalloc.size == 1
+
+
+def test_cluster_panics():
+    crash_reports = [get_crash_report_from_buf(PANIC) for _ in range(3)]
+    clusterer = cluster_panics(crash_reports, threshold=0.8)
+    (cluster,) = clusterer
+    assert (cluster.representative, cluster.size) == ("btn_rst", 3)
+    assert clusterer.threshold == 0.8
+
+
+def test_invalid_bands():
+    with pytest.raises(ValueError):
+        PanicClusterer(num_perm=64, bands=10)
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from pycrashreport.compare import compare_corpora, crash_signature
+from pycrashreport.crash_report import get_crash_report_from_path
+
+TESTS = Path(__file__).parent
+ABORT = TESTS / "user_mode_crash_report_ios14_non_symbolicated_abort.ips"
+SYMBOLICATED = TESTS / "user_mode_crash_report_ios14_symbolicated.ips"
+MONTEREY = TESTS / "user_mode_crash_report_monterey_non_symbolicated.ips"
+PANIC = TESTS / "kernel_mode_crash_report_ios16_forceReset-full.ips"
+
+
+def reports(*paths):
+    return [get_crash_report_from_path(path) for path in paths]
+
+
+def test_crash_signature():
+    (abort, symbolicated, panic) = reports(ABORT, SYMBOLICATED, PANIC)
+    assert crash_signature(symbolicated, frame_count=2) == (
+        "kaki: EXC_CRASH (SIGABRT) @ "
+        "libsystem_kernel.dylib!__pthread_kill > libsystem_pthread.dylib!pthread_kill"
+    )
+    assert crash_signature(abort, frame_count=1) == (
+        "itunescloudd: EXC_CRASH (SIGABRT) @ libsystem_kernel.dylib+0x29334"
+    )
+    assert crash_signature(panic) == "panic: btn_rst [com.apple.driver.AppleM68Buttons]"
+
+
+def test_compare_corpora():
+    before = reports(ABORT, ABORT, ABORT, SYMBOLICATED, PANIC)
+    after = reports(ABORT, MONTEREY, MONTEREY, MONTEREY, PANIC)
+    signatures = {
+        path: crash_signature(report)
+        for path, report in zip(
+            (ABORT, SYMBOLICATED, MONTEREY, PANIC),
+            reports(ABORT, SYMBOLICATED, MONTEREY, PANIC),
+        )
+    }
+    # a single distinct signature in memory forces every count through the spill files
+    deltas = {
+        delta.signature: delta
+        for delta in compare_corpora(before, after, partitions=3, max_keys=1)
+    }
+    assert deltas[signatures[MONTEREY]].status == "appeared"
+    assert deltas[signatures[MONTEREY]].after == 3
+    assert deltas[signatures[SYMBOLICATED]].status == "disappeared"
+    assert deltas[signatures[ABORT]].status == "changed"
+    assert (deltas[signatures[ABORT]].before, deltas[signatures[ABORT]].after) == (3, 1)
+    # same frequency on both sides
+    assert signatures[PANIC] not in deltas
@@ -0,0 +1,101 @@
+import gc
+import gzip
+import io
+import json
+import lzma
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pycrashreport import compression
+from pycrashreport.crash_report import (
+    get_crash_report_from_file,
+    get_crash_report_from_path,
+    get_crash_report_metadata_from_path,
+    get_crash_reports_from_directory,
+)
+
+TESTS = Path(__file__).parent
+SYMBOLICATED = TESTS / "user_mode_crash_report_ios14_symbolicated.ips"
+PANIC = TESTS / "kernel_mode_crash_report_ios16_forceReset-full.ips"
+
+COMPRESSORS = {".gz": gzip.compress, ".xz": lzma.compress}
+if compression.zstandard is not None:
+    COMPRESSORS[".zst"] = compression.zstandard.ZstdCompressor().compress
+
+
+class CountingReader(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self._file = io.BytesIO(data)
+        self.consumed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._file.readinto(buffer)
+        self.consumed += count
+        return count
+
+
+@pytest.mark.parametrize("suffix", COMPRESSORS)
+def test_compressed_path(tmp_path, suffix):
+    expected = get_crash_report_from_path(PANIC)
+    path = tmp_path / f"panic.ips{suffix}"
+    path.write_bytes(COMPRESSORS[suffix](PANIC.read_bytes()))
+
+    crash_report = get_crash_report_from_path(path)
+    assert crash_report.filename == str(path)
+    assert crash_report.panic_string == expected.panic_string
+    assert crash_report.kernel_extensions_in_backtrace == (
+        expected.kernel_extensions_in_backtrace
+    )
+    assert get_crash_report_metadata_from_path(path) == expected.metadata
+
+
+def test_file_handles():
+    # plain binary, compressed binary and text handles alike
+    data = SYMBOLICATED.read_bytes()
+    for file in (
+        io.BytesIO(data),
+        io.BytesIO(gzip.compress(data)),
+        io.StringIO(data.decode()),
+    ):
+        assert get_crash_report_from_file(file).name == "kaki"
+
+
+def test_metadata_decompresses_first_block_only():
+    # incompressible padding, so the archive is much larger than one read
+    data = lzma.compress(SYMBOLICATED.read_bytes() + os.urandom(1 << 18).hex().encode())
+    reader = CountingReader(data)
+    with compression.open_text(reader) as file:
+        assert json.loads(file.readline())["name"] == "kaki"
+    assert reader.consumed < len(data) // 10
+
+
+def test_directory_includes_compressed(tmp_path):
+    (tmp_path / "a.ips").write_bytes(SYMBOLICATED.read_bytes())
+    (tmp_path / "b.ips.gz").write_bytes(gzip.compress(PANIC.read_bytes()))
+    (tmp_path / "c.txt.gz").write_bytes(gzip.compress(PANIC.read_bytes()))
+    names = [
+        Path(crash_report.filename).name
+        for crash_report in get_crash_reports_from_directory(tmp_path)
+    ]
+    assert names == ["a.ips", "b.ips.gz"]
+
+
+def test_text_handles_without_text_io_base():
+    with tempfile.NamedTemporaryFile("w+", encoding="utf-8") as file:
+        file.write(SYMBOLICATED.read_text())
+        file.seek(0)
+        assert get_crash_report_from_file(file).name == "kaki"
+
+
+@pytest.mark.parametrize("compress", [bytes, gzip.compress, lzma.compress])
+def test_binary_handle_stays_open(compress):
+    file = io.BytesIO(compress(SYMBOLICATED.read_bytes()))
+    assert get_crash_report_from_file(file).name == "kaki"
+    gc.collect()
+    assert not file.closed
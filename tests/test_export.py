@@ -0,0 +1,118 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from pycrashreport.crash_report import (
+    get_crash_report_from_buf,
+    get_crash_report_from_path,
+)
+from pycrashreport.export import SCHEMAS, ExportFormat, Exporter, export_crash_reports
+
+REPORTS = sorted(Path(__file__).parent.glob("*.ips"))
+ROW_COUNTS = {
+    "metadata": 6,
+    "exception": 3,
+    "frames": 25,
+    "registers": 92,
+    "panic": 1,
+    "kexts": 170,
+}
+
+
+def crash_reports():
+    return [get_crash_report_from_path(path, projection=()) for path in REPORTS]
+
+
+@pytest.mark.parametrize("output_format", [ExportFormat.PARQUET, ExportFormat.ARROW])
+def test_arrow_formats(tmp_path, output_format):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    from pycrashreport.export import arrow_schema
+
+    assert export_crash_reports(crash_reports(), tmp_path, output_format) == ROW_COUNTS
+    tables = {}
+    for name in SCHEMAS:
+        path = tmp_path / f"{name}.{output_format.value}"
+        if output_format is ExportFormat.PARQUET:
+            tables[name] = pq.read_table(path)
+        else:
+            tables[name] = pa.ipc.open_file(path).read_all()
+        assert tables[name].schema == arrow_schema(name)
+        assert len(tables[name]) == ROW_COUNTS[name]
+
+    (panic,) = tables["panic"].to_pylist()
+    assert panic["panic_string"] == "btn_rst"
+    assert panic["panicked_task_name"] == "kernel_task"
+    (in_backtrace,) = (
+        tables["kexts"].filter(tables["kexts"]["in_backtrace"]).to_pylist()
+    )
+    assert in_backtrace["end"] == 0xFFFFFFF02E156783
+    # every table joins back to its report's metadata row
+    reports = {row["report"]: row for row in tables["metadata"].to_pylist()}
+    assert reports[panic["report"]]["bug_type"] == "151"
+    assert {row["report"] for row in tables["frames"].to_pylist()} == {
+        row["report"] for row in tables["exception"].to_pylist()
+    }
+
+
+def test_row_groups(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    with Exporter(tmp_path, batch_size=50, max_workers=3) as exporter:
+        for _ in range(4):
+            for crash_report in crash_reports():
+                exporter.add(crash_report)
+    assert exporter.report_count == 24
+    kexts = pq.ParquetFile(tmp_path / "kexts.parquet")
+    # the 170 kexts of each panic fill a batch, written as one row group
+    assert kexts.metadata.num_rows == 4 * 170
+    assert kexts.metadata.num_row_groups == 4
+    assert pq.ParquetFile(tmp_path / "panic.parquet").metadata.num_row_groups == 1
+
+
+def test_csv(tmp_path):
+    export_crash_reports(crash_reports(), tmp_path, ExportFormat.CSV)
+    with open(tmp_path / "metadata.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == [name for name, _ in SCHEMAS["metadata"]]
+    assert len(rows) == ROW_COUNTS["metadata"]
+    (panic,) = (row for row in rows if row["bug_type"] == "151")
+    assert panic["timestamp"] == "2022-12-24T11:43:00.470000+00:00"
+    assert panic["name"] == panic["bundle_id"] == ""
+
+
+def test_unknown_table(tmp_path):
+    with pytest.raises(ValueError):
+        Exporter(tmp_path, ExportFormat.CSV, tables=["metadata", "threads"])
+
+
+@pytest.mark.parametrize("output_format", list(ExportFormat))
+def test_malformed_timestamp(tmp_path, output_format):
+    if output_format is not ExportFormat.CSV:
+        pytest.importorskip("pyarrow")
+    # strict parsing, as the export command does by default
+    metadata = {"bug_type": "999", "name": "late", "timestamp": "yesterday"}
+    malformed = get_crash_report_from_buf(json.dumps(metadata))
+    counts = export_crash_reports(
+        [*crash_reports(), malformed], tmp_path, output_format
+    )
+    assert counts["metadata"] == ROW_COUNTS["metadata"] + 1
+    if output_format is ExportFormat.CSV:
+        with open(tmp_path / "metadata.csv", newline="") as f:
+            (row,) = (row for row in csv.DictReader(f) if row["name"] == "late")
+        assert row["timestamp"] == ""
+    else:
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+
+        path = tmp_path / f"metadata.{output_format.value}"
+        if output_format is ExportFormat.PARQUET:
+            table = pq.read_table(path)
+        else:
+            table = pa.ipc.open_file(path).read_all()
+        (row,) = (row for row in table.to_pylist() if row["name"] == "late")
+        assert row["timestamp"] is None
@@ -0,0 +1,108 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from pycrashreport.filters import Filter, filter_crash_reports
+
+TESTS = Path(__file__).parent
+REPORTS = sorted(TESTS.glob("*.ips"))
+
+
+class CountingReader(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self._file = io.BytesIO(data)
+        self.consumed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._file.readinto(buffer)
+        self.consumed += count
+        return count
+
+
+def names(expression):
+    return sorted(
+        str(crash_report.name)
+        for crash_report in filter_crash_reports(REPORTS, expression)
+    )
+
+
+def test_metadata_predicates():
+    assert names("bug_type == 109") == ["itunescloudd", "kaki"]
+    assert names("bug_type == 109 and not name == kaki") == ["itunescloudd"]
+    assert names("timestamp >= 2023-01-01 and timestamp < '2023-06-01'") == ["Finder"]
+    assert names("name ~ '^mds_'") == ["mds_stores"]
+
+
+def test_aware_timestamps():
+    # kaki crashed at 18:14:26 +0200
+    assert names("timestamp >= 2022-01-21T16:14:26+00:00 and bug_type == 109") == [
+        "kaki"
+    ]
+    assert names("timestamp >= 2022-01-21T16:14:26 and bug_type == 109") == ["kaki"]
+    assert names("timestamp >= 2022-01-21T18:14:27+02:00") == [
+        "Finder",
+        "None",
+        "mds_stores",
+    ]
+
+
+def test_bug_type_is_numeric():
+    assert names("bug_type > 99 and bug_type < 152") == ["None", "itunescloudd", "kaki"]
+
+
+def test_failing_fields_match_nothing():
+    class BrokenReport:
+        metadata = {"bug_type": "309", "timestamp": "yesterday"}
+
+        @property
+        def exception_type(self):
+            raise KeyError("exception")
+
+    for expression in (
+        "exception_type == EXC_CRASH",
+        "not exception_type == EXC_CRASH",
+        "bug_type == 309 and timestamp < 2024-01-01",
+    ):
+        assert not Filter(expression)(BrokenReport())
+    assert (
+        Filter("timestamp < 2024-01-01").match_metadata(BrokenReport.metadata) is False
+    )
+
+
+def test_body_predicates():
+    assert names('exception_type == "EXC_BAD_ACCESS"') == ["sleep"]
+    assert names("panic_string == btn_rst or name == kaki") == ["None", "kaki"]
+    assert names("duration > 5 and bug_type != 385") == ["Finder"]
+    assert names(r"exception_type ~ '\(SIGABRT\)' and bug_type == 109") == [
+        "itunescloudd",
+        "kaki",
+    ]
+
+
+def test_plan():
+    where = Filter("(bug_type == 109 or bug_type == 309) and exception_type ~ BAD")
+    assert where.metadata_fields == {"bug_type"}
+    assert where.body_fields == {"exception_type"}
+    assert where.match_metadata({"bug_type": "210"}) is False
+    assert where.match_metadata({"bug_type": "309"}) is None
+
+
+def test_rejected_body_is_never_read():
+    metadata = json.dumps({"bug_type": "210", "name": "panic"}).encode()
+    reader = CountingReader(metadata + b"\n" + b"x" * (1 << 20))
+    assert Filter("bug_type == 109").read(reader) is None
+    assert reader.consumed < 1 << 16
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["", "bug_type", "bug_type ==", "nope == 1", "(bug_type == 1", "bug_type == 1 or"],
+)
+def test_invalid(expression):
+    with pytest.raises(ValueError):
+        Filter(expression)
@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+from pycrashreport.crash_report import (
+    Image,
+    get_crash_report_from_buf,
+    get_crash_report_from_path,
+)
+from pycrashreport.images import ImageCatalog
+
+TESTS = Path(__file__).parent
+
+
+def test_text_report_images():
+    crash_report = get_crash_report_from_path(
+        TESTS / "user_mode_crash_report_ios14_non_symbolicated_abort.ips"
+    )
+    assert crash_report.images[3] == Image(
+        name="libdispatch.dylib",
+        path="/usr/lib/system/libdispatch.dylib",
+        uuid="FF408738-D75B-3061-AD99-4A929C0162D2",
+        arch="arm64e",
+        base=0x1957C7000,
+        size=0x45000,
+    )
+
+
+def test_catalog_interns_across_reports():
+    catalog = ImageCatalog()
+    path = TESTS / "user_mode_crash_report_monterey_non_symbolicated.ips"
+    first = catalog.add(get_crash_report_from_path(path))
+    second = catalog.add(get_crash_report_from_path(path))
+    assert first.ids == second.ids
+    assert len(catalog) == len(first)
+
+    (image_id,) = catalog.find_by_uuid("e58814ccdcb735a5badce367ed3ac207")
+    assert catalog[image_id].path == "/usr/lib/system/libsystem_c.dylib"
+    assert catalog.find_by_path("/usr/lib/system/libsystem_c.dylib") == [image_id]
+    assert first[first.ids.index(image_id)].base == 0x7FF80C65C000
+
+    assert first.lookup(0x7FF80C65C000 + 0x108A9) == (image_id, 0x108A9)
+    assert first.lookup(0x7FF80C65C000 + 561152) is None
+    (dyld_id,) = catalog.find_by_path("/usr/lib/dyld")
+    assert first.lookup(0x113F47000 + 0x54FE) == (dyld_id, 0x54FE)
+
+
+def test_catalog_text_and_json_reports():
+    catalog = ImageCatalog()
+    for filename in (
+        "user_mode_crash_report_ios14_symbolicated.ips",
+        "user_mode_crash_report_ios14_non_symbolicated_abort.ips",
+    ):
+        catalog.add(get_crash_report_from_path(TESTS / filename))
+    assert len(catalog.find_by_path("/usr/lib/system/libdispatch.dylib")) == 2
+    assert catalog.find_by_uuid("00000000-0000-0000-0000-000000000000") == []
+
+
+def test_text_report_image_layouts():
+    crash_report = get_crash_report_from_buf(
+        json.dumps({"bug_type": "109", "name": "Helper"}) + "\nBinary Images:\n"
+        "0x100000000 - 0x100003fff Google Chrome Helper arm64  "
+        "<5fd6c4ca55493855959fbe077158c67a> /Applications/Helper\n"
+        "0x100010000 - 0x100013fff +com.example.Plugin (1.0 - 1) "
+        "<E4CB388A-3274-3695-9BF2-39CA68687233> /Library/Plugin\n"
+        "0x100020000 - 0x100023fff ???\n"
+        "0x100030000 - 0x100033fff dyld arm64  <e4cb388a327436959bf239ca68687233> "
+        "/usr/lib/dyld\n"
+        "\n"
+        "0x100040000 - 0x100043fff after arm64  <e4cb388a327436959bf239ca68687233>\n"
+    )
+    names = [(image.name, image.arch, image.path) for image in crash_report.images]
+    assert names == [
+        ("Google Chrome Helper", "arm64", "/Applications/Helper"),
+        ("com.example.Plugin", None, "/Library/Plugin"),
+        ("dyld", "arm64", "/usr/lib/dyld"),
+    ]
@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from pycrashreport.crash_report import get_crash_report_from_path
+from pycrashreport.json_projection import loads_projected
+
+MONTEREY_REPORT = (
+    Path(__file__).parent / "user_mode_crash_report_monterey_non_symbolicated.ips"
+)
+
+DOCUMENT = json.dumps(
+    {
+        "skipped": {"a": ["]", "}", '"\\"[{'], "b": [1, 2.5e3, True, None]},
+        "threads": [{"id": 0}, {"id": 1, "name": "w[o]rker"}, {"id": 2}],
+        "faultingThread": 1,
+        "exception": {"type": "EXC_BAD_ACCESS"},
+        "tail": "é",
+    },
+    indent=2,
+)
+
+
+def test_projection():
+    assert loads_projected(DOCUMENT, ["exception", "tail"]) == {
+        "exception": {"type": "EXC_BAD_ACCESS"},
+        "tail": "é",
+    }
+
+
+def test_projection_of_array_entry_selected_later():
+    assert loads_projected(DOCUMENT, ["faultingThread", "threads[faultingThread]"]) == {
+        "faultingThread": 1,
+        "threads": [None, {"id": 1, "name": "w[o]rker"}, None],
+    }
+
+
+def test_invalid_document():
+    with pytest.raises(json.JSONDecodeError):
+        loads_projected('{"a": [1, 2}', ["b"])
+    with pytest.raises(json.JSONDecodeError):
+        loads_projected('{"a": 1} trailing', ["a"])
+
+
+def test_projected_crash_report_matches_full_decode():
+    full = get_crash_report_from_path(MONTEREY_REPORT)
+    projected = get_crash_report_from_path(MONTEREY_REPORT, projection=["procName"])
+    assert projected.frames == full.frames
+    assert projected.registers == full.registers
+    assert projected.exception_type == full.exception_type
+    assert projected._data["procName"] == "sleep"
+    assert "vmSummary" not in projected._data
+    assert "vmSummary" in full._data
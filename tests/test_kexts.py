@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from pycrashreport.crash_report import KernelExtension, get_crash_report_from_buf
+from pycrashreport.kexts import KextCatalog
+
+PANIC = (
+    Path(__file__).parent / "kernel_mode_crash_report_ios16_forceReset-full.ips"
+).read_text()
+
+
+def test_loaded_kernel_extensions():
+    crash_report = get_crash_report_from_buf(PANIC)
+    extensions = crash_report.loaded_kernel_extensions
+    assert len(extensions) == len(crash_report.loaded_kexts) == 169
+    assert extensions[0] == KernelExtension(
+        name="com.apple.driver.AppleUSBDeviceMux",
+        version="1.0.0d1",
+        uuid=None,
+        start=None,
+        end=None,
+    )
+
+
+def test_catalog():
+    catalog = KextCatalog()
+    crash_report = get_crash_report_from_buf(PANIC)
+    without_l2tp = get_crash_report_from_buf(
+        PANIC.replace("com.apple.nke.l2tp\\t1.9\\n", "")
+    )
+    upgraded = get_crash_report_from_buf(
+        PANIC.replace("com.apple.nke.l2tp\\t1.9\\n", "com.apple.nke.l2tp\\t2.0\\n")
+    )
+    panics = [catalog.add(report) for report in (crash_report, without_l2tp, upgraded)]
+
+    # loaded kexts plus the backtrace one, which carries a uuid: shared by all panics
+    assert len(catalog) == 169 + 1 + 1
+    assert catalog.panic_count == 3
+    assert list(panics[0]) == crash_report.loaded_kernel_extensions
+    # the same ids, less the removed kext
+    assert panics[1].loaded == panics[0].loaded[:1] + panics[0].loaded[2:]
+    assert "com.apple.nke.l2tp" in panics[0]
+    assert "com.apple.nke.l2tp" not in panics[1]
+
+    assert catalog.panics_with("com.apple.nke.l2tp") == [0, 2]
+    assert catalog.panics_with("com.apple.nke.l2tp", version="2.0") == [2]
+    assert catalog.panics_with("com.apple.driver.AppleM68Buttons") == [0, 1, 2]
+    assert catalog.panics_with("com.example.missing") == []
+
+    (backtrace_id,) = panics[2].backtrace
+    assert catalog[backtrace_id].uuid == "6AAC7152-26B3-355D-95F0-EC89EFA4152C"
+    assert catalog[backtrace_id].size == 0xFFFFFFF02E156783 - 0xFFFFFFF02E13C800 + 1
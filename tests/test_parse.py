@@ -1,8 +1,10 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from pycrashreport.crash_report import (
     BugType,
+    CrashReportBase,
+    ExcResourceReport,
     Frame,
     Register,
     get_crash_report_from_buf,
@@ -415,6 +417,68 @@ def test_panic_210_with_panic_string_field():
         filename="panic.ips",
     )
     assert crash_report.bug_type == BugType.Panic_210
+    assert crash_report.aware_timestamp == datetime(
+        2026, 3, 30, 15, 6, 50, tzinfo=timezone(-timedelta(hours=7))
+    )
+    assert crash_report.epoch_microseconds == 1774908410000000
     assert crash_report.panic_string == "watchdog timeout"
     assert crash_report.panic_caller == 0xFFFFFFF015F5BA38
     assert crash_report.debugger_message == "panic"
+
+
+def test_exc_resource_cpu_usage():
+    filename = str(Path(__file__).parent / "exc_resource_cpu_report_macos_sonoma.ips")
+    crash_report = get_crash_report_from_file(open(filename, "rt"))
+    assert isinstance(crash_report, ExcResourceReport)
+    assert crash_report.bug_type == BugType.ExcResource_385
+    assert crash_report.command == "mds_stores"
+    assert crash_report.event == "cpu usage"
+    assert crash_report.action_taken == "none"
+    assert crash_report.resource == "CPU"
+    assert crash_report.limit == 90
+    assert crash_report.limit_duration == 180
+    assert crash_report.observed == 90
+    assert crash_report.observed_duration == 127
+    assert crash_report.duration == 127.33
+    assert crash_report.steps == 22
+
+    heaviest_stack = crash_report.heaviest_stacks["the target process"]
+    assert len(heaviest_stack) == 4
+    assert heaviest_stack[0].samples == 22
+    assert heaviest_stack[-1].name == "SIStoreIndexData + 412 (Spotlight + 301180)"
+    assert crash_report.call_tree.count == 22
+
+
+def test_exc_resource_wakeups_327():
+    crash_report = get_crash_report_from_buf(
+        "\n".join(
+            [
+                '{"bug_type":"327","timestamp":"2023-11-02 14:21:07.00 +0100","name":"kaki"}',
+                "Command:          kaki",
+                "Event:            wakeups",
+                "Action taken:     none",
+                "Wakeups:          45001 wakeups over the last 197 seconds (228 wakeups per second average), exceeding limit of 150 wakeups per second over 300 seconds",
+                "Wakeups limit:    45000",
+                "Limit duration:   300s",
+                "Wakeups caused:   45001",
+                "Wakeups duration: 197s",
+            ]
+        ),
+        filename="wakeups.ips",
+    )
+    assert crash_report.bug_type == BugType.ExcResourceThreads_327
+    assert crash_report.resource == "Wakeups"
+    assert crash_report.limit == 45000
+    assert crash_report.observed == 45001
+    assert crash_report.observed_duration == 197
+    assert crash_report.heaviest_stacks == {}
+
+
+def test_symptoms_reports_keep_basic_parsing():
+    # no sample of these layouts to build a parser on: metadata only
+    for bug_type in ("142", "202", "206"):
+        crash_report = get_crash_report_from_buf(
+            f'{{"bug_type":"{bug_type}","name":"kaki"}}\nCommand: kaki\n'
+        )
+        assert type(crash_report) is CrashReportBase
+        assert crash_report.name == "kaki"
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from pycrashreport.crash_report import get_crash_report_from_path
+from pycrashreport.registers import Register, RegisterFile, extract_registers
+
+TESTS = Path(__file__).parent
+ARM64_REPORT = TESTS / "user_mode_crash_report_ios14_non_symbolicated_abort.ips"
+X86_64_REPORT = TESTS / "user_mode_crash_report_monterey_non_symbolicated.ips"
+
+
+def test_arm64_register_file():
+    crash_report = get_crash_report_from_path(ARM64_REPORT)
+    register_file = crash_report.register_file
+    assert register_file.architecture == "arm64"
+    assert register_file["pc"] == 0x00000001C3E1A334
+    assert register_file[register_file.index("lr")] == 0x00000001E18A1A9C
+    assert register_file["x4"] == 0x000000016F6763D0
+    assert register_file.get("far") is None
+    assert "far" not in register_file
+    with pytest.raises(KeyError):
+        register_file["far"]
+    assert sorted(register_file) == sorted(crash_report.registers)
+
+
+def test_x86_64_register_file():
+    register_file = get_crash_report_from_path(X86_64_REPORT).register_file
+    assert register_file.architecture == "x86_64"
+    assert register_file["rip"] == 0
+    assert register_file["rflags"] == 66119
+    assert len(register_file) == 22
+    assert Register(name="cpu", value=8) in list(register_file)
+
+
+def test_extract_registers():
+    crash_reports = [
+        get_crash_report_from_path(ARM64_REPORT),
+        get_crash_report_from_path(X86_64_REPORT),
+        get_crash_report_from_path(ARM64_REPORT),
+    ]
+    vectors = extract_registers(crash_reports, ("pc", "rip"))
+    assert list(vectors["pc"].values) == [0x1C3E1A334, 0, 0x1C3E1A334]
+    assert list(vectors["pc"].present) == [1, 0, 1]
+    assert list(vectors["rip"].present) == [0, 1, 0]
+
+
+def test_register_index_out_of_range():
+    register_file = get_crash_report_from_path(ARM64_REPORT).register_file
+    for index in (-1, len(register_file.layout)):
+        with pytest.raises(IndexError):
+            register_file.get(index)
+        with pytest.raises(IndexError):
+            register_file[index]
+    # a slot of the layout that the report doesn't hold
+    with pytest.raises(IndexError):
+        register_file[register_file.index("far")]
+    with pytest.raises(KeyError):
+        register_file["far"]
+
+
+def test_unknown_architecture():
+    register_file = RegisterFile.from_registers([])
+    assert register_file.architecture is None
+    assert (register_file.present, len(register_file)) == (0, 0)
+    assert register_file.get("pc") is None
+
+    register_file = RegisterFile.from_registers([Register(name="eip", value=1)])
+    assert register_file.layout == ()
+    assert register_file["eip"] == 1
+    assert list(register_file) == [Register(name="eip", value=1)]
+    with pytest.raises(ValueError):
+        RegisterFile.from_registers([], architecture="ppc")
+
+
+def test_extract_registers_without_registers():
+    class TextReport:
+        registers = []
+        register_file = RegisterFile.from_registers(registers)
+
+    crash_reports = [TextReport(), get_crash_report_from_path(ARM64_REPORT)]
+    vectors = extract_registers(crash_reports, ("pc",))
+    assert list(vectors["pc"].present) == [0, 1]
@@ -0,0 +1,67 @@
+from io import StringIO
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from pycrashreport.__main__ import app
+from pycrashreport.crash_report import get_crash_report_from_path
+from pycrashreport.render import OutputFormat, Renderer
+
+TESTS = Path(__file__).parent
+REPORTS = sorted(TESTS.glob("*.ips"))
+
+
+def render(crash_report, output_format):
+    stream = StringIO()
+    Renderer(stream, output_format).render(crash_report)
+    return stream.getvalue()
+
+
+def test_ansi_matches_previous_str():
+    # str() output from before the renderer, with the report path left out
+    for path in REPORTS:
+        crash_report = get_crash_report_from_path(path)
+        expected = (
+            (TESTS / "rendered" / f"{path.stem}.txt")
+            .read_text()
+            .replace("{filename}", str(path))
+        )
+        assert render(crash_report, OutputFormat.ANSI) == expected
+        assert str(crash_report) == expected
+
+
+def test_plain_has_no_escapes():
+    for path in REPORTS:
+        crash_report = get_crash_report_from_path(path)
+        plain = render(crash_report, OutputFormat.PLAIN)
+        assert "\x1b" not in plain
+        assert plain.startswith(
+            f"{crash_report.incident_id} {crash_report.timestamp}\n"
+        )
+
+
+def test_compact_is_one_line_per_report():
+    crash_report = get_crash_report_from_path(
+        TESTS / "user_mode_crash_report_ios14_symbolicated.ips"
+    )
+    assert render(crash_report, OutputFormat.COMPACT) == (
+        "2416C26A-72A8-4687-AFAA-7FCEB9D77458\t2022-01-21 18:14:26\t109\tkaki\t"
+        "EXC_CRASH (SIGABRT) @ libsystem_kernel.dylib!__pthread_kill\n"
+    )
+    for path in REPORTS:
+        line = render(get_crash_report_from_path(path), OutputFormat.COMPACT)
+        assert line.count("\n") == 1
+        assert line.count("\t") == 4
+
+
+def test_cli_renders_every_file():
+    result = CliRunner().invoke(
+        app, [*(str(path) for path in REPORTS), "--format", "compact"]
+    )
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == len(REPORTS)
+
+    # not a terminal: plain by default
+    result = CliRunner().invoke(app, [str(REPORTS[0])])
+    assert result.exit_code == 0
+    assert "\x1b" not in result.output
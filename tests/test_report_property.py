@@ -0,0 +1,109 @@
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from pycrashreport.__main__ import app
+from pycrashreport.crash_report import (
+    CrashReportBase,
+    UserModeCrashReport,
+    get_crash_report_from_buf,
+    get_crash_reports_from_paths,
+    get_crash_reports_from_directory,
+    summarize_errors,
+)
+from pycrashreport.report_property import MalformedReportError, report_property
+
+SYMBOLICATED = (
+    Path(__file__).parent / "user_mode_crash_report_ios14_symbolicated.ips"
+).read_text()
+BROKEN_FRAME = SYMBOLICATED.replace("__pthread_kill + 8", "__pthread_kill 8 garbage", 1)
+NO_FAULTING_THREAD = SYMBOLICATED.replace("Triggered by Thread:  0\n", "")
+
+
+def test_strict_mode_raises():
+    with pytest.raises(MalformedReportError):
+        _ = get_crash_report_from_buf(BROKEN_FRAME).frames
+    with pytest.raises(MalformedReportError):
+        _ = get_crash_report_from_buf(NO_FAULTING_THREAD).faulting_thread
+    with pytest.raises(ValueError):
+        get_crash_report_from_buf("not json\n")
+
+
+def test_tolerant_partial_report():
+    crash_report = get_crash_report_from_buf(BROKEN_FRAME, tolerant=True)
+    assert isinstance(crash_report, UserModeCrashReport)
+    assert crash_report.frames == []
+    assert crash_report.exception_type == "EXC_CRASH (SIGABRT)"
+    assert [error.field for error in crash_report.errors] == ["frames"]
+    assert isinstance(crash_report.errors[0].error, MalformedReportError)
+    # cached: the failure is recorded once
+    assert crash_report.frames == []
+    assert len(crash_report.errors) == 1
+    # renders whatever could be parsed
+    assert "EXC_CRASH (SIGABRT)" in str(crash_report)
+
+
+def test_tolerant_metadata():
+    crash_report = get_crash_report_from_buf("not json\nbody", tolerant=True)
+    assert type(crash_report) is CrashReportBase
+    assert crash_report.name is None
+    fields = [error.field for error in crash_report.parse_all()]
+    assert fields[0] == "metadata"
+    assert "bug_type_str" in fields
+
+
+def test_summarize_errors(tmp_path):
+    (tmp_path / "good.ips").write_text(SYMBOLICATED)
+    (tmp_path / "frame.ips").write_text(BROKEN_FRAME)
+    (tmp_path / "thread.ips").write_text(NO_FAULTING_THREAD)
+    (tmp_path / "binary.ips").write_bytes(b"\xff\xfe\n\x00")
+
+    crash_reports = list(get_crash_reports_from_directory(tmp_path, tolerant=True))
+    assert len(crash_reports) == 4
+    summary = summarize_errors(crash_reports)
+    assert summary[("frames", "MalformedReportError")] == 1
+    assert summary[("faulting_thread", "MalformedReportError")] == 1
+    assert summary[("metadata", "JSONDecodeError")] == 1
+
+    result = CliRunner().invoke(app, ["check", str(tmp_path)])
+    assert result.exit_code == 0
+    assert "frames MalformedReportError" in result.output
+
+
+class SlowReport(CrashReportBase):
+    calls = 0
+
+    @report_property
+    def slow(self):
+        SlowReport.calls += 1
+        time.sleep(0.01)
+        return [self.name]
+
+
+def test_shared_report_resolves_once():
+    crash_report = SlowReport({"name": "shared", "bug_type": "109"}, "")
+    barrier = threading.Barrier(8)
+
+    def resolve(_):
+        barrier.wait()
+        return crash_report.slow
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(resolve, range(8)))
+    assert SlowReport.calls == 1
+    assert all(result is results[0] for result in results)
+    # reports still pickle, lock aside
+    assert pickle.loads(pickle.dumps(crash_report)).slow == ["shared"]
+
+
+def test_get_crash_reports_from_paths():
+    paths = sorted(Path(__file__).parent.glob("*.ips")) * 5
+    crash_reports = list(get_crash_reports_from_paths(paths, max_workers=2))
+    assert [crash_report.filename for crash_report in crash_reports] == [
+        str(path) for path in paths
+    ]
@@ -0,0 +1,109 @@
+import json
+import random
+
+import pytest
+
+from pycrashreport.crash_report import get_crash_report_metadata_from_paths
+from pycrashreport.sampling import (
+    Reservoir,
+    StratifiedSampler,
+    sample_crash_reports,
+)
+
+# share of EXC_BAD_ACCESS reports per process
+BAD_ACCESS = {"a": 0.1, "b": 0.5, "c": 0.9}
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("corpus")
+    generator = random.Random(0)
+    paths = []
+    bad_access = 0
+    for index in range(3000):
+        name = generator.choice(sorted(BAD_ACCESS))
+        exception_type = "EXC_CRASH"
+        if generator.random() < BAD_ACCESS[name]:
+            exception_type = "EXC_BAD_ACCESS"
+            bad_access += 1
+        path = directory / f"{index}.ips"
+        path.write_text(
+            json.dumps({"bug_type": generator.choice(["109", "309"]), "name": name})
+            + f"\nException Type: {exception_type}\n"
+        )
+        paths.append(path)
+    return paths, bad_access
+
+
+def test_reservoir():
+    reservoir = Reservoir(4)
+    generator = random.Random(0)
+    for path in range(100):
+        reservoir.add(path, generator)
+    assert reservoir.population == 100
+    assert len(set(reservoir.paths)) == 4
+
+
+def test_metadata_in_order(corpus):
+    paths, _ = corpus
+    metadata = list(get_crash_report_metadata_from_paths(paths[:200], max_workers=4))
+    assert metadata == [json.loads(path.open().readline()) for path in paths[:200]]
+
+
+def test_estimate(corpus):
+    paths, bad_access = corpus
+    sample = sample_crash_reports(paths, per_stratum=40, seed=1)
+    assert sample.population == len(paths)
+    assert sample.sampled == 6 * 40
+    assert sum(sample.stratum_counts().values()) == len(paths)
+
+    estimate = sample.estimate("exception_type == EXC_BAD_ACCESS")
+    assert estimate.low <= bad_access <= estimate.high
+    assert estimate.error < 0.1 * len(paths)
+    counts = sample.estimate_counts(lambda crash_report: crash_report.exception_type)
+    assert counts.keys() == {"EXC_BAD_ACCESS", "EXC_CRASH"}
+    assert counts["EXC_BAD_ACCESS"].count + counts["EXC_CRASH"].count == len(paths)
+
+
+def test_fully_sampled_strata_are_exact(corpus):
+    paths, bad_access = corpus
+    sample = sample_crash_reports(paths, per_stratum=len(paths))
+    estimate = sample.estimate(
+        lambda crash_report: crash_report.exception_type == "EXC_BAD_ACCESS"
+    )
+    assert (estimate.count, estimate.error) == (bad_access, 0)
+
+
+def test_where(corpus):
+    paths, _ = corpus
+    sampler = StratifiedSampler(per_stratum=8, where="name != a")
+    sampler.add_paths(paths)
+    assert {name for _, name in sampler.strata} == {"b", "c"}
+
+
+def test_where_body_predicate(corpus):
+    paths, bad_access = corpus
+    sampler = StratifiedSampler(
+        per_stratum=len(paths), where="exception_type == EXC_CRASH"
+    )
+    sampler.add_paths(paths)
+    sample = sampler.parse()
+    counts = sample.estimate_counts(lambda crash_report: crash_report.exception_type)
+    assert counts.keys() == {"EXC_CRASH"}
+    assert counts["EXC_CRASH"].count == len(paths) - bad_access
+    crashed_a = sum(
+        '"name": "a"' in text and "EXC_CRASH" in text
+        for text in (path.read_text() for path in paths)
+    )
+    assert sample.estimate("name == a").count == crashed_a
+
+
+def test_unreadable(tmp_path, corpus):
+    paths, _ = corpus
+    broken = tmp_path / "broken.ips"
+    broken.write_text("not json\n")
+    sampler = StratifiedSampler(per_stratum=8)
+    sampler.add_paths([*paths[:10], broken], tolerant=True)
+    assert (sampler.population, sampler.unreadable) == (10, 1)
+    with pytest.raises(ValueError):
+        StratifiedSampler().add_paths([broken])
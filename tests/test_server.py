@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from http.client import HTTPConnection
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from pycrashreport import server as server_module
+from pycrashreport.server import ReportServer
+
+PANIC = Path(__file__).parent / "kernel_mode_crash_report_ios16_forceReset-full.ips"
+
+
+@pytest.fixture
+def server(request):
+    executor_class = getattr(request, "param", ThreadPoolExecutor)
+    with ReportServer(
+        executor_factory=partial(executor_class, 2),
+        max_pending=1,
+        max_request_size=1 << 20,
+    ) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+
+
+def call(server, path, data=None):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    try:
+        with urlopen(Request(url, data=data), timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize(
+    "server", [ThreadPoolExecutor, ProcessPoolExecutor], indirect=True
+)
+def test_parse(server):
+    status, body = call(server, "/parse", PANIC.read_bytes())
+    assert status == 200
+    assert body["panic_string"] == "btn_rst"
+    assert body["kernel_extensions_in_backtrace"][0]["name"] == (
+        "com.apple.driver.AppleM68Buttons"
+    )
+    assert body["errors"] == []
+
+    status, body = call(server, "/parse", b"garbage")
+    assert status == 200
+    assert body["errors"][0]["field"] == "metadata"
+
+    status, metrics = call(server, "/metrics")
+    assert status == 200
+    assert metrics["completed"] == 2
+    assert metrics["latency_p50"] is not None
+
+
+def test_limits(server, monkeypatch):
+    # refused from the headers alone, before any of the body is sent
+    connection = HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+    connection.putrequest("POST", "/parse")
+    connection.putheader("Content-Length", str(1 << 21))
+    connection.endheaders()
+    assert connection.getresponse().status == 413
+    connection.close()
+
+    # hold the only slot with a report that is still parsing
+    release = threading.Event()
+    parse_report = server_module.parse_report
+
+    def blocked(data):
+        release.wait(10)
+        return parse_report(data)
+
+    monkeypatch.setattr(server_module, "parse_report", blocked)
+    first = ThreadPoolExecutor(1).submit(call, server, "/parse", PANIC.read_bytes())
+    while server.metrics.snapshot()["in_flight"] == 0:
+        time.sleep(0.01)
+    status, _ = call(server, "/parse", PANIC.read_bytes())
+    assert status == 503
+    release.set()
+    assert first.result()[0] == 200
+
+    metrics = call(server, "/metrics")[1]
+    assert metrics["rejected"] == 1
+    assert metrics["too_large"] == 1
+
+
+@pytest.mark.parametrize("server", [ProcessPoolExecutor], indirect=True)
+def test_dead_worker(server):
+    assert call(server, "/parse", PANIC.read_bytes())[0] == 200
+    broken = server.executor
+    for process in list(broken._processes.values()):
+        process.kill()
+        process.join()
+
+    # the pool is replaced and the report parsed again, on every later request too
+    for _ in range(2):
+        status, body = call(server, "/parse", PANIC.read_bytes())
+        assert status == 200
+        assert body["panic_string"] == "btn_rst"
+    assert server.executor is not broken
+    assert call(server, "/metrics")[1]["restarted"] == 1
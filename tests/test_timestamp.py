@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pycrashreport.timestamp import (
+    parse_timestamp,
+    parse_timestamp_epoch,
+    parse_timestamp_naive,
+)
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        "2021-10-22 00:14:53.00 +0300",
+        "2022-12-24 11:43:00.47 +0000",
+        "2026-03-30 15:06:50.00 -0700",
+        "2023-02-11 09:12:31.118 +0530",
+        "2000-02-29 23:59:59 +0000",
+        "1969-12-31 23:59:59.999999 -0100",
+    ],
+)
+def test_matches_strptime(timestamp):
+    expected = datetime.strptime(
+        timestamp if "." in timestamp else timestamp.replace(" +", ".0 +"),
+        "%Y-%m-%d %H:%M:%S.%f %z",
+    )
+    assert parse_timestamp(timestamp) == expected
+    assert parse_timestamp(timestamp).utcoffset() == expected.utcoffset()
+    assert parse_timestamp_naive(timestamp) == expected.replace(tzinfo=None)
+    assert parse_timestamp_epoch(timestamp) == round(expected.timestamp() * 1000000)
+
+
+def test_timezone_offset_is_kept():
+    timestamp = parse_timestamp("2026-03-30 15:06:50.00 -0700")
+    assert timestamp.tzinfo == timezone(-timedelta(hours=7))
+
+
+def test_invalid_timestamp():
+    with pytest.raises(ValueError):
+        parse_timestamp("30/03/2026 15:06:50")
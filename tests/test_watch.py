@@ -0,0 +1,73 @@
+import os
+import shutil
+from pathlib import Path
+
+from pycrashreport.watch import DirectoryWatcher
+
+CRASH_REPORT = Path(__file__).parent / "user_mode_crash_report_ios14_symbolicated.ips"
+
+
+def test_watch_new_and_partial_reports(tmp_path):
+    reports = tmp_path / "DiagnosticReports"
+    reports.mkdir()
+    old = reports / "old.ips"
+    shutil.copy(CRASH_REPORT, old)
+    os.utime(old, ns=(0, 0))
+    (reports / "notes.txt").write_text("ignored")
+
+    cursor = tmp_path / "cursor.json"
+    watcher = DirectoryWatcher(reports, cursor)
+    assert [Path(report.filename).name for report in watcher.poll()] == ["old.ips"]
+    assert watcher.poll() == []
+
+    # a report still being written is only parsed once it stops changing
+    content = CRASH_REPORT.read_text()
+    partial = reports / "partial.ips"
+    partial.write_text(content[:100])
+    assert watcher.poll() == []
+    partial.write_text(content)
+    assert watcher.poll() == []
+    (crash_report,) = watcher.poll()
+    assert crash_report.incident_id == "2416C26A-72A8-4687-AFAA-7FCEB9D77458"
+
+    # already seen reports are remembered through the cursor
+    assert DirectoryWatcher(reports, cursor).poll() == []
+    os.remove(partial)
+    assert DirectoryWatcher(reports, cursor).poll() == []
+
+
+def test_watch_rewritten_and_broken_reports(tmp_path):
+    reports = tmp_path / "DiagnosticReports"
+    reports.mkdir()
+    cursor = tmp_path / "cursor.json"
+    watcher = DirectoryWatcher(reports, cursor)
+
+    # a partially written body that fails beyond the metadata line is retried
+    content = CRASH_REPORT.read_text()
+    metadata, _ = content.split("\n", 1)
+    report = reports / "report.ips"
+    report.write_text(metadata + '\n{\n  \n"incident" : "')
+    assert watcher.poll() == []
+    assert watcher.poll() == []
+    report.write_text(content)
+    assert watcher.poll() == []
+    (crash_report,) = watcher.poll()
+    assert crash_report.incident_id == "2416C26A-72A8-4687-AFAA-7FCEB9D77458"
+
+    # replaced by a new file under the same name: parsed again
+    temporary = tmp_path / "report.tmp"
+    temporary.write_text(content + "\n")
+    os.utime(temporary, ns=(0, 0))
+    os.replace(temporary, report)
+    # directory mtimes are coarser than the polls
+    os.utime(reports, ns=(1, 1))
+    assert len(watcher.poll()) == 1
+    assert watcher.poll() == []
+
+    # rewritten in place while nobody was watching: parsed again on resuming
+    report.write_text(content + "\n\n")
+    os.utime(report, ns=(0, 0))
+    resumed = DirectoryWatcher(reports, cursor)
+    assert len(resumed.poll()) == 1
+    assert resumed.poll() == []
+    assert DirectoryWatcher(reports, cursor).poll() == []
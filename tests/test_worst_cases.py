@@ -0,0 +1,198 @@
+import gc
+import io
+import json
+import os
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from pycrashreport.clustering import PanicClusterer
+from pycrashreport.crash_report import get_crash_report_from_buf
+from pycrashreport.filters import Filter
+from pycrashreport.kexts import KextCatalog
+
+REPORTS = sorted(Path(__file__).parent.glob("*.ips"))
+
+# inputs are built at SIZE and SCALE times SIZE: linear work grows about SCALE times,
+# quadratic work SCALE**2 times. SLACK absorbs timer noise and fixed costs
+SIZE = 2000
+SCALE = 8
+SLACK = 3
+# peak traced memory per input character, python objects included
+MEMORY_PER_CHAR = 32
+
+# wall clock and traced memory depend on the machine: opt in with
+# PYCRASHREPORT_SCALING_TESTS=1, the default run only checks tolerant parsing
+scaling = pytest.mark.skipif(
+    not os.environ.get("PYCRASHREPORT_SCALING_TESTS"),
+    reason="set PYCRASHREPORT_SCALING_TESTS=1 to run the scaling checks",
+)
+
+
+def metadata(bug_type: str) -> str:
+    return json.dumps(
+        {"bug_type": bug_type, "name": "worst", "timestamp": "2023-01-01 00:00:00.00"}
+    )
+
+
+def panic(panic_string: str) -> str:
+    return metadata("210") + "\n" + json.dumps({"panicString": panic_string})
+
+
+# size -> adversarial report text
+ADVERSARIAL = {
+    "huge_single_line": lambda n: metadata("109") + "\n" + "Exception Type" * n * 4,
+    "huge_metadata_line": lambda n: (
+        json.dumps({"bug_type": "109", "name": "x" * n * 64}) + "\n"
+    ),
+    "many_loaded_kexts": lambda n: panic(
+        "btn_rst\nloaded kexts:\n" + "com.apple.driver.AppleX\t1.0\n" * n * 2
+    ),
+    "unbalanced_kext_parens": lambda n: panic(
+        "btn_rst\nKernel Extensions in backtrace:\n" + "com.apple.x(" * n + "\n"
+        "loaded kexts:\n" + "(" * n * 4 + ")" + "\n"
+    ),
+    "deep_thread_list": lambda n: (
+        metadata("309")
+        + "\n"
+        + json.dumps(
+            {
+                "faultingThread": n - 1,
+                "usedImages": [{"path": "/usr/lib/libworst.dylib", "base": 4096}],
+                "exception": {"type": "EXC_BAD_ACCESS"},
+                "threads": [{"frames": [{"imageIndex": 0}] * 4} for _ in range(n)],
+            }
+        )
+    ),
+    "unterminated_text_frames": lambda n: (
+        metadata("109")
+        + "\nTriggered by Thread: 0\nThread 0 Crashed:\n"
+        + "0 libworst.dylib 0x1000 + 16\n" * n
+        + "Application Specific Information:\n"
+        + "abort() called\n" * n
+    ),
+    "unterminated_separators": lambda n: metadata("309") + "\n" + "{\n  \n" * n * 2,
+    "deep_call_tree": lambda n: (
+        metadata("288")
+        + "\nCommand: worst\n\nThread 0x1\n"
+        + "".join(f"{' ' * (i % 512)}1 frame{i} + 1\n" for i in range(n * 2))
+    ),
+}
+
+
+def parse(text: str) -> None:
+    crash_report = get_crash_report_from_buf(text, tolerant=True)
+    crash_report.parse_all()
+    json.dumps(crash_report.to_dict())
+    str(crash_report)
+
+
+def filter_panic(text: str) -> None:
+    Filter("bug_type == 210 and panic_string ~ watchdog").read(
+        io.BytesIO(text.encode())
+    )
+
+
+def cluster(text: str) -> None:
+    PanicClusterer().add(text)
+
+
+def catalog(text: str) -> None:
+    KextCatalog().add(get_crash_report_from_buf(text, tolerant=True))
+
+
+# (entry point, input) pairs
+CASES = [
+    *((parse, name) for name in ADVERSARIAL),
+    (filter_panic, "many_loaded_kexts"),
+    (filter_panic, "unbalanced_kext_parens"),
+    (cluster, "huge_single_line"),
+    (catalog, "many_loaded_kexts"),
+    (catalog, "unbalanced_kext_parens"),
+]
+IDS = [f"{entry.__name__}-{name}" for entry, name in CASES]
+
+
+def elapsed(entry, text: str, repeat: int = 3) -> float:
+    # without the cyclic collector, whose passes also scan whatever the rest of the
+    # test session keeps alive
+    best = float("inf")
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            entry(text)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def peak_memory(entry, text: str) -> int:
+    tracemalloc.start()
+    try:
+        entry(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@scaling
+@pytest.mark.parametrize(("entry", "name"), CASES, ids=IDS)
+def test_linear_time(entry, name):
+    small = ADVERSARIAL[name](SIZE)
+    large = ADVERSARIAL[name](SIZE * SCALE)
+    # a few milliseconds of fixed cost would hide the growth of the small run
+    entry(small)
+    assert elapsed(entry, large) < SCALE * SLACK * max(elapsed(entry, small), 1e-3)
+
+
+@scaling
+@pytest.mark.parametrize(("entry", "name"), CASES, ids=IDS)
+def test_bounded_memory(entry, name):
+    text = ADVERSARIAL[name](SIZE * SCALE)
+    assert peak_memory(entry, text) < MEMORY_PER_CHAR * len(text)
+
+
+def mutate(generator: random.Random, text: str) -> str:
+    position = generator.randrange(len(text))
+    kind = generator.randrange(5)
+    if kind == 0:
+        # truncated upload
+        return text[:position]
+    if kind == 1:
+        # a terminator or delimiter inserted or dropped
+        return (
+            text[:position]
+            + generator.choice(["", "\n", "\n  \n", "(", ")", "[", '"', "\t", "0x"])
+            + text[position + 1 :]
+        )
+    if kind == 2:
+        # joined lines
+        return text[:position] + text[position:].replace("\n", " ", 32)
+    if kind == 3:
+        # a repeated line
+        start = text.rfind("\n", 0, position) + 1
+        end = text.find("\n", position) + 1 or len(text)
+        return text[:end] + text[start:end] * generator.randrange(2, 64) + text[end:]
+    lines = text.split("\n")
+    body = lines[1:]
+    generator.shuffle(body)
+    return "\n".join(lines[:1] + body)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_mutated_reports_parse_tolerantly(seed):
+    # tolerant parsing of a corrupted report always returns, never raises
+    generator = random.Random(seed)
+    texts = [path.read_text() for path in REPORTS]
+    for _ in range(100):
+        text = generator.choice(texts)
+        for _ in range(generator.randrange(1, 4)):
+            if text:
+                text = mutate(generator, text)
+        parse(text)